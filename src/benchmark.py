@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Chatty pipeline benchmark
+Drives capture → convert → decode → output without a microphone or display
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import wave
+import argparse
+import platform
+import threading
+import collections
+import numpy as np
+
+import chatty
+
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 1000  # Same 62.5 ms blocks the microphone stream delivers
+
+# Lower is better for every compared value; paths point into the report
+COMPARED_VALUES = [
+    ("pipeline", "summary", "rtf", "p50"),
+    ("pipeline", "summary", "rtf", "p95"),
+    ("pipeline", "summary", "latency_s", "p95"),
+    ("pipeline", "memory_mb_per_min"),
+    ("frames", "dots_idle", "p95_us"),
+    ("frames", "dots_recording", "p95_us"),
+    ("frames", "waveform_idle", "p95_us"),
+    ("frames", "waveform_recording", "p95_us"),
+]
+
+class NullOutput:
+    """Output backend that keeps the text instead of typing it"""
+
+    def __init__(self):
+        self.texts = []
+
+    def output(self, text):
+        self.texts.append(text)
+
+class FakeCanvas:
+    """Stand-in for tk.Canvas that only counts the calls a frame makes"""
+
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.next_item = 0
+
+    def _create(self, *args, **kwargs):
+        self.calls['create'] += 1
+        self.next_item += 1
+        return self.next_item
+
+    create_oval = _create
+    create_line = _create
+
+    def delete(self, *args):
+        self.calls['delete'] += 1
+
+    def coords(self, item, *args):
+        self.calls['coords'] += 1
+
+    def itemconfig(self, item, **kwargs):
+        self.calls['itemconfig'] += 1
+
+class BenchChatty(chatty.Chatty):
+    """Chatty with the microphone, hotkeys and window left out"""
+
+    def __init__(self, overrides, debug_mode=False):
+        self.overrides = overrides
+        super().__init__(None, debug_mode=debug_mode)
+        self.output_backend = NullOutput()
+        self.dots_canvas = FakeCanvas()
+
+    def load_config(self):
+        super().load_config()
+        # No pauses around pasting and nothing written to the user's metrics or history
+        self.config.update(show_text_seconds=0, paste_delay_seconds=0, clear_after_seconds=0,
+                           metrics_file=None, history_enabled=False)
+        self.config.update(self.overrides)
+
+    def schedule(self, callback, delay_ms=0):
+        # Stands in for the Tk main loop, so callbacks never run on the worker that asked
+        threading.Timer(delay_ms / 1000, callback).start()
+
+    def open_audio_stream(self, block_size):
+        pass
+
+    def setup_hotkeys(self):
+        pass
+
+def get_rss_mb():
+    """Resident memory of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def load_fixture(path):
+    """Read a 16-bit mono 16 kHz WAV or raw PCM file as int16 samples"""
+    if path.lower().endswith('.wav'):
+        with wave.open(path, 'rb') as audio_file:
+            if (audio_file.getnchannels() != 1 or audio_file.getsampwidth() != 2
+                    or audio_file.getframerate() != SAMPLE_RATE):
+                raise ValueError(f"{path}: expected 16-bit mono 16 kHz WAV")
+            data = audio_file.readframes(audio_file.getnframes())
+    else:
+        with open(path, 'rb') as f:
+            data = f.read()
+    return np.frombuffer(data, dtype=np.int16)
+
+def synthesize_fixture(seconds, seed=0):
+    """Speech-like test signal: voiced harmonics and noise in syllable-rate bursts"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.25 * t) > -0.5)
+    signal = 0.15 * envelope * voiced + 0.005 * rng.standard_normal(len(t))
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+def feed_fixture(app, samples):
+    """Push a fixture through audio_callback block by block, like the microphone would"""
+    if app.capture_dtype == "float32":
+        samples = samples.astype(np.float32) / 32768
+    for start in range(0, len(samples) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        app.audio_callback(samples[start:start + BLOCK_SIZE].tobytes(), BLOCK_SIZE, None, None)
+        # Let the capture worker and streaming decoder keep up instead of dropping blocks
+        while len(app.capture_ring) > 4 or (app.streaming and app.decode_queue.qsize() > 4):
+            time.sleep(0.001)
+
+def run_utterance(app, name, samples, timeout):
+    """Record, stop and wait for one fixture to be transcribed and pasted"""
+    recorded = len(app.metrics.records)
+    rss_before = get_rss_mb()
+
+    app.start_recording()
+    feed_fixture(app, samples)
+    rss_growth = get_rss_mb() - rss_before
+    app.stop_recording()
+
+    deadline = time.time() + timeout
+    while len(app.metrics.records) == recorded:
+        if time.time() > deadline:
+            raise TimeoutError(f"{name}: no transcription after {timeout}s")
+        time.sleep(0.005)
+
+    audio_seconds = len(samples) / SAMPLE_RATE
+    metrics = dict(app.last_metrics)
+    metrics.update({
+        "fixture": name,
+        "rss_growth_mb": round(rss_growth, 2),
+        "mb_per_min": round(rss_growth / (audio_seconds / 60), 3),
+        "text": app.output_backend.texts[-1] if app.output_backend.texts else "",
+    })
+    return metrics
+
+def bench_pipeline(app, fixtures, repeat):
+    """Transcribe every fixture and summarize RTF, latency and memory growth"""
+    if not app.model_ready.wait(timeout=120) or app.model is None:
+        return {"error": "model not loaded"}
+
+    # One untimed utterance so one-time allocations don't count as growth
+    run_utterance(app, "warmup", synthesize_fixture(2), timeout=60)
+    app.metrics.records.clear()
+
+    results = []
+    for _ in range(repeat):
+        for name, samples in fixtures:
+            results.append(run_utterance(app, name, samples, timeout=60 + len(samples) / SAMPLE_RATE))
+
+    return {
+        "utterances": results,
+        "summary": chatty.summarize_metrics(list(app.metrics.records)),
+        "memory_mb_per_min": max(result["mb_per_min"] for result in results),
+        "rss_mb": round(get_rss_mb(), 1),
+    }
+
+def bench_frames(app, frames, seed=0):
+    """Time draw_animated_dots and draw_waveform per frame, idle and recording"""
+    rng = np.random.default_rng(seed)
+    draw = {'dots': app.draw_animated_dots, 'waveform': app.draw_waveform}
+    results = {}
+    app.recording = False  # The pipeline bench may have left a recording flag behind
+
+    for mode in app.visual_modes:
+        for recording in (False, True):
+            app.visual_mode = mode
+            app.recording = recording
+            app.canvas_mode = None  # Rebuild items as a mode switch would
+            app.dots_canvas.calls.clear()
+            times = []
+            for frame in range(frames):
+                # Levels as the audio thread would leave them between frames
+                app.target_levels[:] = rng.uniform(0, 40, 4)
+                app.waveform_history.push(rng.uniform(0, 1))
+                app.frame_count = frame
+                start = time.perf_counter_ns()
+                draw[mode]()
+                times.append(time.perf_counter_ns() - start)
+
+            times = sorted(times[1:])  # The first frame builds the canvas items
+            calls = sum(app.dots_canvas.calls.values()) / frames
+            results[f"{mode}_{'recording' if recording else 'idle'}"] = {
+                "p50_us": round(chatty.percentile(times, 0.50) / 1000, 2),
+                "p95_us": round(chatty.percentile(times, 0.95) / 1000, 2),
+                "canvas_calls_per_frame": round(calls, 2),
+            }
+
+    app.recording = False
+    return results
+
+def lookup(report, path):
+    for key in path:
+        if not isinstance(report, dict) or key not in report:
+            return None
+        report = report[key]
+    return report
+
+def compare_reports(baseline, report, tolerance):
+    """List values that got worse than the baseline by more than tolerance"""
+    regressions = []
+    for path in COMPARED_VALUES:
+        old, new = lookup(baseline, path), lookup(report, path)
+        if old is None or new is None:
+            continue
+        # Memory growth hovers around zero, so small absolute changes aren't regressions
+        limit = max(old * (1 + tolerance), old + 0.5) if path[-1] == "memory_mb_per_min" \
+            else old * (1 + tolerance)
+        status = "REGRESSION" if new > limit else "ok"
+        if status != "ok":
+            regressions.append(".".join(path))
+        print(f"{'.'.join(path):40} {old:>10} → {new:<10} {status}", file=sys.stderr)
+    return regressions
+
+def parse_override(text):
+    """Parse a --set key=value option; values are JSON where possible"""
+    key, _, value = text.partition('=')
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Chatty recognition pipeline')
+    parser.add_argument('fixtures', nargs='*',
+                        help='16-bit mono 16 kHz WAV or raw PCM files (default: synthetic audio)')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the fixtures')
+    parser.add_argument('--frames', type=int, default=2000, help='Frames timed per visual mode')
+    parser.add_argument('--set', action='append', default=[], type=parse_override,
+                        metavar='KEY=VALUE', help='Override a config.json setting')
+    parser.add_argument('-o', '--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='Compare against an earlier report; exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Allowed slowdown relative to the baseline (default 15%%)')
+    parser.add_argument('--debug', action='store_true', help='Show Chatty debug output')
+    args = parser.parse_args()
+
+    # The stub paste backend must not touch the real clipboard
+    chatty.pyperclip = types.SimpleNamespace(copy=lambda text: None)
+    chatty.vosk.SetLogLevel(-1)
+
+    if args.fixtures:
+        fixtures = [(os.path.basename(path), load_fixture(path))
+                    for path in chatty.find_audio_files(args.fixtures)]
+    else:
+        fixtures = [(f"synthetic_{seconds}s", synthesize_fixture(seconds, seed=seconds))
+                    for seconds in (5, 30, 60)]
+
+    app = BenchChatty(dict(args.set), debug_mode=args.debug)
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "model": chatty.get_model_path(app.config),
+            "config": {key: app.config[key] for key in ("streaming", "vad_enabled", "capture_dtype")},
+        },
+        "pipeline": bench_pipeline(app, fixtures, args.repeat),
+        "frames": bench_frames(app, args.frames),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare_reports(baseline, report, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
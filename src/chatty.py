@@ -4,35 +4,603 @@ Chatty - Voice-to-Text with animated interface
 Animated dots that bounce when speaking, with text display and smart controls
 """
 
+import time
+STARTUP_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import font as tkFont
 import threading
-import time
+import queue
 import math
-import random
+from collections import deque
 import os
 import sys
+import signal
+import socket
+import struct
+import wave
+import importlib
 from datetime import datetime
-from vosk import Model, KaldiRecognizer
-import sounddevice as sd
 import json
-import numpy as np
-import pyperclip
 import subprocess
-from pynput import keyboard
+
+# Startup phases and imports, shown by --profile-startup
+startup_timings = []
+
+def record_startup(phase, start):
+    """Note how long a startup phase took and when it finished"""
+    end = time.perf_counter()
+    startup_timings.append((phase, end - start, end - STARTUP_START,
+                            threading.current_thread().name))
+
+def print_startup_profile():
+    """Write the startup timings to the terminal, even when output is hidden"""
+    out = sys.__stderr__
+    print("⏱ Startup profile (ms)          took    done at  thread", file=out)
+    for phase, took, done_at, thread in startup_timings:
+        print(f"  {phase:28} {took * 1000:7.1f} {done_at * 1000:9.1f}  {thread}", file=out)
+
+class LazyModule:
+    """Stands in for a heavy module until first use, then replaces itself with it"""
+
+    def __init__(self, name, alias):
+        self._name = name
+        self._alias = alias
+
+    def __getattr__(self, attr):
+        start = time.perf_counter()
+        module = importlib.import_module(self._name)
+        record_startup(f"import {self._name}", start)
+        # Later uses of the global go straight to the real module
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+# Imported on first use, so the window can appear before they load
+asyncio = LazyModule("asyncio", "asyncio")
+vosk = LazyModule("vosk", "vosk")
+sd = LazyModule("sounddevice", "sd")
+np = LazyModule("numpy", "np")
+pyperclip = LazyModule("pyperclip", "pyperclip")
+sqlite3 = LazyModule("sqlite3", "sqlite3")
+keyboard = LazyModule("pynput.keyboard", "keyboard")
+
+record_startup("import standard library", STARTUP_START)
+
+class CaptureBuffer:
+    """Growable buffer of raw int16 PCM bytes with a hard limit on audio not yet decoded"""
+
+    def __init__(self, max_seconds, sample_rate=16000, initial_seconds=10):
+        self.sample_rate = sample_rate
+        self.max_bytes = int(max_seconds * sample_rate) * 2
+        self._data = bytearray(min(int(initial_seconds * sample_rate) * 2, self.max_bytes))
+        self._size = 0
+        self._consumed = 0
+        self._lock = threading.Lock()  # The capture worker appends while the decoder consumes
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def duration(self):
+        """Seconds of audio recorded, including audio already consumed"""
+        return (self._consumed + self._size) / (2 * self.sample_rate)
+
+    def append(self, block):
+        """Copy a block into the buffer, returning False once the limit is reached"""
+        with self._lock:
+            end = self._size + len(block)
+            if end > self.max_bytes:
+                return False
+
+            if end > len(self._data):
+                # Grow geometrically so appends stay amortized O(1)
+                capacity = min(max(end, 2 * len(self._data)), self.max_bytes)
+                self._data.extend(bytes(capacity - len(self._data)))
+
+            self._data[self._size:end] = block
+            self._size = end
+            return True
+
+    def consume(self, size):
+        """Drop the oldest size bytes once they have been decoded"""
+        with self._lock:
+            size = min(size, self._size)
+            # Only the undecoded tail moves; capacity is kept for reuse
+            self._data[:self._size - size] = self._data[size:self._size]
+            self._size -= size
+            self._consumed += size
+
+    def getvalue(self):
+        """Return the audio not yet consumed as bytes for the recognizer"""
+        with self._lock:
+            return bytes(memoryview(self._data)[:self._size])
+
+class RecognizerPool:
+    """Keeps recognizers ready so an utterance never waits for construction"""
+
+    def __init__(self, model, sample_rate=16000, size=2, grammar=None):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.size = size
+        self.grammar = grammar
+        self.last_acquire_ms = 0.0
+        self._ready = []
+        self._preparing = False
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a ready recognizer, building one only if none is waiting"""
+        start_time = time.perf_counter()
+        with self._lock:
+            recognizer = self._ready.pop() if self._ready else None
+
+        if recognizer is None:
+            recognizer = new_recognizer(self.model, self.sample_rate, self.grammar)
+        self.last_acquire_ms = (time.perf_counter() - start_time) * 1000
+
+        # Have the next one ready before the following utterance asks for it
+        self.prepare()
+        return recognizer
+
+    def release(self, recognizer):
+        """Reset a finished recognizer and keep it for reuse"""
+        recognizer.Reset()
+        with self._lock:
+            if len(self._ready) < self.size:
+                self._ready.append(recognizer)
+
+    def prepare(self):
+        """Build a spare recognizer in the background if the pool is empty"""
+        with self._lock:
+            if self._ready or self._preparing:
+                return
+            self._preparing = True
+        threading.Thread(target=self._build_spare, daemon=True).start()
+
+    def _build_spare(self):
+        try:
+            recognizer = new_recognizer(self.model, self.sample_rate, self.grammar)
+            with self._lock:
+                if len(self._ready) < self.size:
+                    self._ready.append(recognizer)
+        finally:
+            self._preparing = False
+
+def send_frame(sock, op, payload=b''):
+    """Write one model host frame: 1-byte op, 4-byte length, payload"""
+    sock.sendall(op + len(payload).to_bytes(4, 'big') + payload)
+
+def recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("model host closed the connection")
+        data.extend(chunk)
+    return bytes(data)
+
+def recv_frame(sock):
+    """Read one model host frame, returning (op, payload)"""
+    header = recv_exactly(sock, 5)
+    return header[:1], recv_exactly(sock, int.from_bytes(header[1:], 'big'))
+
+class RemoteRecognizer:
+    """KaldiRecognizer look-alike that decodes on a shared model host"""
+
+    def __init__(self, socket_path, sample_rate, grammar=None, trusted_uids=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        # Audio goes out and text to be typed comes back, so only talk to a trusted host
+        if trusted_uids is not None:
+            uid = get_socket_peer_uid(self.sock, socket_path)
+            if uid not in trusted_uids:
+                self.sock.close()
+                raise PermissionError(f"model host at {socket_path} runs as untrusted uid {uid}")
+        self._call(b'N', json.dumps({"sample_rate": sample_rate, "grammar": grammar}).encode())
+
+    def __del__(self):
+        self.sock.close()
+
+    def _call(self, op, payload=b''):
+        send_frame(self.sock, op, payload)
+        status, reply = recv_frame(self.sock)
+        if status != b'K':
+            raise RuntimeError(f"model host error: {reply.decode()}")
+        return reply
+
+    def AcceptWaveform(self, data):
+        return self._call(b'A', data) == b'1'
+
+    def Result(self):
+        return self._call(b'R').decode()
+
+    def PartialResult(self):
+        return self._call(b'P').decode()
+
+    def FinalResult(self):
+        return self._call(b'F').decode()
+
+    def Reset(self):
+        self._call(b'X')
+
+class RemoteModel:
+    """Stands in for a Vosk Model that lives in a model host process"""
+
+    def __init__(self, socket_path, trusted_uids=None):
+        self.socket_path = socket_path
+        self.trusted_uids = trusted_uids
+
+def get_socket_peer_uid(sock, path):
+    """uid of the process at the other end of a connected Unix socket"""
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        return struct.unpack('3i', creds)[1]
+    # Without peer credentials, the socket file is owned by whoever bound it
+    return os.stat(path).st_uid
+
+def new_recognizer(model, sample_rate, grammar=None):
+    """Create a recognizer for a local Vosk model or a remote model host
+
+    A grammar (list of phrases) restricts recognition to those phrases,
+    which makes decoding much faster for short commands.
+    """
+    if isinstance(model, RemoteModel):
+        return RemoteRecognizer(model.socket_path, sample_rate, grammar, model.trusted_uids)
+    if grammar:
+        return vosk.KaldiRecognizer(model, sample_rate, json.dumps(grammar))
+    return vosk.KaldiRecognizer(model, sample_rate)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def summarize_metrics(records):
+    """p50/p95/max of every numeric metric across utterance records"""
+    summary = {"utterances": len(records)}
+    fields = sorted({key for record in records for key, value in record.items()
+                     if isinstance(value, (int, float)) and not isinstance(value, bool)})
+    for field in fields:
+        values = sorted(record[field] for record in records
+                        if isinstance(record.get(field), (int, float)))
+        summary[field] = {
+            "p50": round(percentile(values, 0.50), 4),
+            "p95": round(percentile(values, 0.95), 4),
+            "max": round(values[-1], 4),
+        }
+    return summary
+
+class MetricsRecorder:
+    """Keeps recent per-utterance metrics in memory, optionally appending them to JSONL"""
+
+    def __init__(self, path=None, capacity=500):
+        self.path = os.path.expanduser(path) if path else None
+        self.records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def record(self, metrics):
+        """Store one finished utterance's metrics"""
+        with self._lock:
+            self.records.append(metrics)
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path, 'a') as f:
+                    f.write(json.dumps(metrics) + "\n")
+
+    def summary(self):
+        with self._lock:
+            return summarize_metrics(list(self.records))
+
+class TranscriptHistory:
+    """Append-only store of past transcriptions with full-text search
+
+    Uses SQLite FTS5 when available and a plain substring search otherwise.
+    The database is opened on first use, so startup doesn't pay for it.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self._db = None
+        self._fts = False
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._db is None:
+            # Dictation is private, even on shared machines: owner-only directory and file
+            os.makedirs(os.path.dirname(self.path) or '.', mode=0o700, exist_ok=True)
+            os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+            os.chmod(self.path, 0o600)  # Also tightens files created before this check
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS transcripts ("
+                       "id INTEGER PRIMARY KEY, created TEXT NOT NULL, text TEXT NOT NULL)")
+            try:
+                db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5("
+                           "text, content='transcripts', content_rowid='id')")
+                db.execute("CREATE TRIGGER IF NOT EXISTS transcripts_index AFTER INSERT ON transcripts "
+                           "BEGIN INSERT INTO transcripts_fts(rowid, text) VALUES (new.id, new.text); END")
+                self._fts = True
+            except sqlite3.OperationalError:
+                self._fts = False  # SQLite built without FTS5
+            db.commit()
+            self._db = db
+        return self._db
+
+    def add(self, text):
+        """Store one transcription, returning its id"""
+        with self._lock:
+            db = self._connect()
+            cursor = db.execute("INSERT INTO transcripts (created, text) VALUES (?, ?)",
+                                (datetime.now().isoformat(timespec='seconds'), text))
+            db.commit()
+            return cursor.lastrowid
+
+    def search(self, query="", limit=20):
+        """Newest (id, created, text) entries containing every word of the query"""
+        with self._lock:
+            db = self._connect()
+            if not query.strip():
+                rows = db.execute("SELECT id, created, text FROM transcripts "
+                                  "ORDER BY id DESC LIMIT ?", (limit,))
+            elif self._fts:
+                # Quote each word so punctuation isn't read as query syntax; the last is a prefix
+                match = " ".join('"%s"' % word.replace('"', '""') for word in query.split()) + "*"
+                rows = db.execute("SELECT t.id, t.created, t.text FROM transcripts_fts "
+                                  "JOIN transcripts t ON t.id = transcripts_fts.rowid "
+                                  "WHERE transcripts_fts MATCH ? ORDER BY t.id DESC LIMIT ?",
+                                  (match, limit))
+            else:
+                words = query.split()
+                rows = db.execute("SELECT id, created, text FROM transcripts WHERE "
+                                  + " AND ".join(["text LIKE ?"] * len(words))
+                                  + " ORDER BY id DESC LIMIT ?",
+                                  [f"%{word}%" for word in words] + [limit])
+            return rows.fetchall()
+
+    def get(self, entry_id):
+        """The (id, created, text) entry with this id, or None"""
+        with self._lock:
+            return self._connect().execute("SELECT id, created, text FROM transcripts WHERE id = ?",
+                                           (entry_id,)).fetchone()
+
+class LevelMeter:
+    """Computes level, peak and band energies of an audio block into reused buffers"""
+
+    def __init__(self, block_size, sample_rate=16000, num_bands=4, min_freq=100, full_scale=1.0):
+        self.block_size = block_size
+        self._inv_scale = np.float32(1.0 / full_scale)
+        self._samples = np.empty(block_size, dtype=np.float32)
+        self._scratch = np.empty(block_size, dtype=np.float32)
+        self._window = np.hanning(block_size).astype(np.float32)
+        self._power = np.empty(block_size // 2 + 1, dtype=np.float64)
+        self.bands = np.zeros(num_bands, dtype=np.float64)
+
+        # Log-spaced bands (100-300-900-2700-8000 Hz for four bands), so each
+        # dot follows a perceptually similar slice of the voice
+        freqs = np.fft.rfftfreq(block_size, 1.0 / sample_rate)
+        edges = np.geomspace(min_freq, sample_rate / 2, num_bands + 1)
+        edges[-1] += 1  # Include the Nyquist bin in the top band
+        masks = (freqs >= edges[:-1, None]) & (freqs < edges[1:, None])
+
+        # One row per band selecting its FFT bins, scaled so the squared bands
+        # add up to the block's mean square (Parseval with the window's power)
+        scale = 2.0 / (block_size * np.dot(self._window, self._window))
+        # plus a +3 dB/octave tilt, since speech has far less energy up high
+        centers = np.sqrt(edges[:-1] * edges[1:])
+        tilt = centers / centers[0]
+        self._band_matrix = masks * (scale * tilt[:, None])
+
+    def process(self, samples, bands=True):
+        """Return (rms, peak) for one block of samples, refreshing self.bands if asked"""
+        if samples.dtype != np.float32:
+            # Integer samples are scaled into a reused buffer, so levels stay 0-1
+            samples = np.multiply(samples, self._inv_scale, out=self._samples[:len(samples)])
+        rms = math.sqrt(np.dot(samples, samples) / len(samples))
+
+        np.abs(samples, out=self._scratch)
+        peak = float(self._scratch.max())
+        if not bands:
+            return rms, peak
+
+        np.multiply(samples, self._window, out=self._scratch)
+        np.abs(np.fft.rfft(self._scratch), out=self._power)
+        np.square(self._power, out=self._power)
+        np.dot(self._band_matrix, self._power, out=self.bands)
+        np.sqrt(self.bands, out=self.bands)
+
+        return rms, peak
+
+class LevelHistory:
+    """Fixed-size ring of recent levels with one writer and one reader thread
+
+    The audio thread pushes and the Tk thread takes snapshots. No lock is
+    needed: the writer publishes a value by bumping the count after storing
+    it, and the ring has spare slots beyond the largest snapshot, so pushes
+    made while a snapshot is copied land outside the values being read.
+    """
+
+    def __init__(self, capacity, spare=4):
+        self.capacity = capacity  # Most levels a snapshot returns
+        self._slots = capacity + spare
+        self._data = np.zeros(self._slots)
+        self._count = 0  # Values ever written, only changed by the writer
+        self._start = 0  # Reader-side marker so the reader can clear without writing
+
+    def __len__(self):
+        return min(self._count - self._start, self.capacity)
+
+    def push(self, value):
+        """Append a level (writer thread only)"""
+        self._data[self._count % self._slots] = value
+        self._count += 1
+
+    def clear(self):
+        """Hide everything written so far (reader thread only)"""
+        self._start = self._count
+
+    def snapshot(self, n):
+        """Return up to the n latest levels, oldest first, as a new array"""
+        count = self._count
+        n = min(n, count - self._start, self.capacity)
+        return self._data.take(np.arange(count - n, count), mode='wrap')
+
+class BlockRing:
+    """Preallocated queue of fixed-size audio blocks for one producer and one consumer
+
+    The audio callback copies each block into the next free slot and the
+    capture worker reads it in place. Like LevelHistory it needs no lock:
+    each side only advances its own counter, after it is done with the slot.
+    """
+
+    def __init__(self, capacity, block_size, dtype="float32"):
+        self.capacity = capacity
+        self._blocks = np.zeros((capacity, block_size), dtype=dtype)
+        self._lengths = np.zeros(capacity, dtype=np.int64)
+        self.written = 0  # Blocks ever stored, only changed by the producer
+        self.read = 0     # Blocks ever consumed, only changed by the consumer
+
+    def __len__(self):
+        return self.written - self.read
+
+    def put(self, data):
+        """Copy a block in (producer only); False if the consumer is too far behind"""
+        if self.written - self.read >= self.capacity:
+            return False
+        slot = self.written % self.capacity
+        samples = np.frombuffer(data, dtype=self._blocks.dtype)
+        self._blocks[slot, :len(samples)] = samples
+        self._lengths[slot] = len(samples)
+        self.written += 1
+        return True
+
+    def peek(self):
+        """The oldest unread block as a view, or None (consumer only)"""
+        if self.read == self.written:
+            return None
+        slot = self.read % self.capacity
+        return self._blocks[slot, :self._lengths[slot]]
+
+    def advance(self):
+        """Release the block returned by peek (consumer only)"""
+        self.read += 1
+
+class VoiceActivityDetector:
+    """Energy-based speech detector that drops silent blocks from a recording"""
+
+    def __init__(self, threshold, block_ms, hangover_ms, auto_stop_ms=0):
+        self.threshold = threshold
+        self.block_ms = block_ms
+        self.auto_stop_ms = auto_stop_ms
+        # Silence kept on each side of speech so word edges aren't clipped
+        self.hangover_blocks = max(1, math.ceil(hangover_ms / block_ms))
+        self.reset()
+
+    def reset(self):
+        """Forget all state before a new recording"""
+        self.speech_seen = False
+        self.silence_ms = 0.0
+        self._blocks_since_speech = self.hangover_blocks
+        self._padding = deque(maxlen=self.hangover_blocks)
+
+    def process(self, block, rms):
+        """Return the blocks worth keeping after seeing this one"""
+        if rms >= self.threshold:
+            self.speech_seen = True
+            self.silence_ms = 0.0
+            self._blocks_since_speech = 0
+            kept = list(self._padding)
+            self._padding.clear()
+            kept.append(block)
+            return kept
+
+        self.silence_ms += self.block_ms
+        if self._blocks_since_speech < self.hangover_blocks:
+            # Trailing edge of speech
+            self._blocks_since_speech += 1
+            return [block]
+
+        # Deep silence: hold on to it only as padding for the next onset
+        self._padding.append(block)
+        return []
+
+    def should_stop(self):
+        """True once speech has been followed by enough trailing silence"""
+        return (self.auto_stop_ms > 0 and self.speech_seen
+                and self.silence_ms >= self.auto_stop_ms)
+
+def press_key_combo(combo):
+    """Press and release a combo like 'ctrl+v' through pynput"""
+    controller = keyboard.Controller()
+    names = combo.lower().split('+')
+    modifiers = [getattr(keyboard.Key, name) for name in names[:-1]]
+    last = getattr(keyboard.Key, names[-1], names[-1])
+
+    for modifier in modifiers:
+        controller.press(modifier)
+    try:
+        controller.tap(last)
+    finally:
+        for modifier in reversed(modifiers):
+            controller.release(modifier)
+
+class ClipboardPasteOutput:
+    """Pastes the clipboard contents with a synthesized key combo"""
+
+    def __init__(self, config):
+        self.paste_keys = config["paste_keys"]
+
+    def output(self, text):
+        try:
+            subprocess.run(['xdotool', 'key', '--clearmodifiers', self.paste_keys], check=True)
+        except FileNotFoundError:
+            # No xdotool installed: synthesize the keys in-process instead
+            press_key_combo(self.paste_keys)
+
+class XdotoolTypeOutput:
+    """Types text with xdotool, one keystroke per character"""
+
+    def __init__(self, config):
+        self.delay_ms = int(config["type_delay_ms"])
+
+    def output(self, text):
+        subprocess.run(['xdotool', 'type', '--delay', str(self.delay_ms), text], check=True)
+
+class PynputTypeOutput:
+    """Types text directly through pynput's keyboard controller"""
+
+    def __init__(self, config):
+        self.controller = keyboard.Controller()
+
+    def output(self, text):
+        self.controller.type(text)
+
+# Selected with the "output_backend" config key
+OUTPUT_BACKENDS = {
+    "clipboard": ClipboardPasteOutput,
+    "xdotool": XdotoolTypeOutput,
+    "pynput": PynputTypeOutput,
+}
 
 class Chatty:
-    def __init__(self, root, debug_mode=False):
+    def __init__(self, root, debug_mode=False, loop=None, profile_startup=False):
+        # Without a Tk root Chatty runs headless, driven by an asyncio loop
         self.root = root
+        self.loop = loop
         self.debug_mode = debug_mode
-        self.setup_window()
-        self.setup_variables()
-        self.load_config()
-        self.setup_ui()
-        self.setup_model()
-        self.setup_audio()
-        self.setup_hotkeys()
-        self.start_animation()
+        self.profile_startup = profile_startup
+
+        # Ordered so the window is on screen before the heavy modules load
+        phases = [self.setup_variables, self.load_config, self.setup_output]
+        if self.root is not None:
+            phases += [self.setup_window, self.setup_ui, self.paint_window]
+        phases += [self.setup_visuals, self.setup_model, self.setup_decoder,
+                   self.setup_audio, self.setup_hotkeys]
+        if self.root is not None:
+            phases.append(self.start_animation)
+
+        for phase in phases:
+            start = time.perf_counter()
+            phase()
+            record_startup(phase.__name__, start)
 
     def load_config(self):
         """Load configuration from config.json"""
@@ -45,7 +613,38 @@ class Chatty:
         # Default configuration
         self.config = {
             "hotkey": "ctrl",
-            "display_name": "Ctrl"
+            "display_name": "Ctrl",
+            "streaming": True,
+            "stream_queue_blocks": 256,
+            "max_record_seconds": 300,
+            "vad_enabled": False,
+            "vad_threshold": 0.01,
+            "vad_hangover_ms": 300,
+            "vad_auto_stop_ms": 0,
+            "output_backend": "clipboard",
+            "paste_keys": "ctrl+v",
+            "type_delay_ms": 0,
+            "show_text_seconds": 1.5,
+            "paste_delay_seconds": 0.3,
+            "clear_after_seconds": 1.0,
+            "animation_fps": 20,
+            "idle_fps": 5,
+            "control_server": False,
+            "control_socket": None,
+            "model_path": None,
+            "use_model_host": False,
+            "model_host_socket": None,
+            "model_host_user": None,
+            "max_pending_jobs": 3,
+            "capture_dtype": "int16",
+            "preroll_ms": 400,
+            "segment_max_seconds": 30,
+            "progressive_paste": False,
+            "history_enabled": True,
+            "history_file": None,
+            "grammars": {},
+            "grammar_hotkeys": {},
+            "metrics_file": None
         }
         
         try:
@@ -61,10 +660,28 @@ class Chatty:
         
         self.debug_print(f"ℹ Using hotkey: {self.config['hotkey']} (display: {self.config['display_name']})")
 
-    def get_hotkey_keys(self):
-        """Convert hotkey string to keyboard key constants"""
-        hotkey = self.config["hotkey"].lower()
-        
+    def setup_output(self):
+        """Create the backend that puts transcribed text at the cursor"""
+        name = self.config["output_backend"].lower()
+        if name not in OUTPUT_BACKENDS:
+            self.debug_print(f"⚠ Unknown output backend '{name}', defaulting to clipboard")
+            name = "clipboard"
+
+        self.output_backend = OUTPUT_BACKENDS[name](self.config)
+        self.debug_print(f"ℹ Using output backend: {name}")
+
+        # Per-utterance timings, also appended to a JSONL file when configured
+        self.metrics = MetricsRecorder(self.config["metrics_file"])
+
+        # Every transcription is kept so lost text can be found and pasted again
+        self.history = None
+        if self.config["history_enabled"]:
+            self.history = TranscriptHistory(get_history_path(self.config))
+
+    def get_hotkey_keys(self, hotkey=None, fallback=True):
+        """Convert hotkey string (the recording hotkey by default) to keyboard key constants"""
+        hotkey = (hotkey or self.config["hotkey"]).lower()
+
         if hotkey == "ctrl":
             return [keyboard.Key.ctrl_l, keyboard.Key.ctrl_r]
         elif hotkey == "alt":
@@ -81,6 +698,8 @@ class Chatty:
             return [keyboard.Key.f3]
         elif hotkey == "f4":
             return [keyboard.Key.f4]
+        elif not fallback:
+            return []
         else:
             # Default to ctrl if unknown
             self.debug_print(f"⚠ Unknown hotkey '{hotkey}', defaulting to ctrl")
@@ -90,6 +709,13 @@ class Chatty:
         """Get the status text with the configured hotkey"""
         return f"{self.config['display_name']}: start"
 
+    def schedule(self, callback, delay_ms=0):
+        """Run a callback on the main thread (Tk or the headless event loop)"""
+        if self.root is not None:
+            self.root.after(delay_ms, callback)
+        else:
+            self.loop.call_soon_threadsafe(self.loop.call_later, delay_ms / 1000, callback)
+
     def debug_print(self, message):
         """Print debug messages only if debug mode is enabled"""
         if self.debug_mode:
@@ -115,7 +741,14 @@ class Chatty:
     def setup_variables(self):
         """Initialize variables"""
         self.recording = False
-        self.audio_buffer = []
+        self.audio_buffer = None
+        self.stop_requested = False
+        self.stop_reason = None  # Set under capture_lock, acted on once it's released
+        self.active_grammar = None
+        self.last_metrics = {}
+        self.record_start_time = time.perf_counter()
+        self.overrun_count = 0
+        self.clipped_blocks = 0
         self.audio_stream = None
         self.hotkey_pressed = False
         self.cmd_pressed = False
@@ -123,49 +756,316 @@ class Chatty:
 
         # Animation variables
         self.animation_running = True
+        self.animation_after_id = None
+        self.last_frame_time = None
         self.frame_count = 0
+        self.window_focused = False
+        self.window_visible = True
         self.current_text = ""
         self.text_visible = False
+        self.status_text = ""
+        self.status_color = '#888888'
+        self.input_level = 0.0
+        self.control_server = None
+        self.partial_text = ""  # Written by the decoder thread
+        self.shown_partial = ""
 
         # Visual mode configuration
         self.visual_modes = ['dots', 'waveform']
         self.current_visual_mode = 0  # Index into visual_modes
         self.visual_mode = self.visual_modes[self.current_visual_mode]
 
+        # Canvas items are created once per visual mode and then only moved
+        self.canvas_items = {}
+        self.canvas_states = {}
+        self.canvas_mode = None
+        self.canvas_recording = None
+
+        # Key state tracking
+        self.hotkey_pressed = False
+        self.grammar_key_pressed = False
+        self.ctrl_pressed = False
+        self.alt_pressed = False
+        self.suppress_hotkeys_until = 0.0
+
+    def paint_window(self):
+        """Draw the window now instead of once every module has loaded"""
+        self.root.update()
+
+    def setup_visuals(self):
+        """Create the level buffers shared by the audio worker and the animation"""
         # Audio level tracking for dots mode
         self.audio_levels = [0, 0, 0, 0]  # 4 dots
-        self.target_levels = [0, 0, 0, 0]
+        self.target_levels = np.zeros(4)
 
         # Audio level tracking for waveform mode
-        self.waveform_history = []
         self.waveform_length = 60  # Number of historical samples to keep
+        self.waveform_history = LevelHistory(self.waveform_length)
         self.waveform_points = []
-
-        # Key state tracking
-        self.hotkey_pressed = False
-        self.ctrl_pressed = False
-        self.alt_pressed = False
+        self.idle_waveform = np.full(30, 0.05)  # Calm baseline shown while not recording
+        self.waveform_index = np.arange(30)
 
     def setup_model(self):
-        """Load the Vosk model"""
-        # Get the directory where this script is located
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Get the project root (parent directory of src)
-        project_root = os.path.dirname(script_dir)
-        # Construct absolute path to model
-        model_path = os.path.join(project_root, "vosk_model", "vosk-model-small-en-us-0.15")
-        
+        """Start loading the Vosk model in the background"""
         self.model = None  # Initialize to None
+        self.recognizer_pool = None
+        self.grammar_pools = {}
+        # Set once loading has finished, whether or not it succeeded
+        self.model_ready = threading.Event()
+
+        # Recording is allowed right away; audio is buffered until the model is ready
+        self.update_status("Loading model…", '#888888')
+        threading.Thread(target=self.load_model, daemon=True).start()
+
+    def load_model(self):
+        """Load the Vosk model and warm it up with a silent decode"""
+        model_path = get_model_path(self.config)
+        project_root = get_project_root()
+
+        start_time = time.time()
+        load_start = time.perf_counter()
         try:
-            self.model = Model(model_path)
-            self.debug_print("✓ Vosk model loaded successfully")
+            # A shared model host saves loading a private copy of the model
+            model = self.connect_model_host() or vosk.Model(model_path)
+            self.debug_print(f"✓ Vosk model loaded successfully ({time.time() - start_time:.2f}s)")
+
+            # One throwaway decode so the first real transcription doesn't pay warm-up cost
+            warmup = new_recognizer(model, 16000)
+            warmup.AcceptWaveform(bytes(16000))  # 0.5s of silence
+            warmup.FinalResult()
+            self.debug_print("✓ Recognizer warmed up")
+
+            # The warmed-up recognizer becomes the first one handed out
+            self.recognizer_pool = RecognizerPool(model)
+            self.recognizer_pool.release(warmup)
+
+            # Grammar recognizers are built in the background, one per grammar
+            for name, phrases in self.config["grammars"].items():
+                self.grammar_pools[name] = RecognizerPool(model, size=1, grammar=phrases)
+                self.grammar_pools[name].prepare()
+            self.model = model
         except Exception as e:
             self.debug_print(f"❌ Error loading model: {e}")
             self.debug_print(f"❌ Attempted model path: {model_path}")
             self.debug_print(f"❌ Model directory exists: {os.path.exists(model_path)}")
             if os.path.exists(project_root):
                 self.debug_print(f"❌ Project root contents: {os.listdir(project_root)}")
+        finally:
+            record_startup("load_model", load_start)
+            self.model_ready.set()
+            self.schedule(self.on_model_loaded)
+
+    def connect_model_host(self):
+        """Return a RemoteModel if a model host is configured and answering"""
+        if not self.config["use_model_host"]:
+            return None
+
+        path = get_model_host_socket(self.config)
+        try:
+            trusted_uids = get_model_host_uids(self.config)
+            RemoteRecognizer(path, 16000, trusted_uids=trusted_uids)
+        except (OSError, RuntimeError, KeyError) as e:
+            self.debug_print(f"⚠ Model host not available at {path} ({e}), loading locally")
+            return None
+
+        self.debug_print(f"✓ Using shared model host at {path}")
+        return RemoteModel(path, trusted_uids)
+
+    def on_model_loaded(self):
+        """Leave the loading state once the model is available"""
+        if self.profile_startup:
+            record_startup("ready", STARTUP_START)
+            print_startup_profile()
+
+        if self.audio_buffer is not None:
+            # A recording was started while loading; its processing owns the status
             return
+        if self.model is None:
+            self.update_status("Model not loaded!", '#ff0000')
+        else:
+            self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+
+    def setup_decoder(self):
+        """Start the decoder and output threads that every utterance passes through in order"""
+        self.streaming = bool(self.config["streaming"])
+        self.stream_overflow = False
+        # Unbounded so control messages never block the Tk thread or the capture worker;
+        # stream_block bounds the audio instead, so a stalled decoder can't grow memory
+        self.decode_queue = queue.Queue()
+        # Finished transcriptions waiting to be shown and pasted
+        self.output_queue = queue.Queue()
+
+        # Utterances stopped but not yet pasted, cancelled or dropped
+        self.pending_jobs = 0
+        self.job_lock = threading.Lock()
+        # Bumped by Escape; jobs from an older generation are dropped
+        self.job_generation = 0
+
+        # One decoder keeps transcriptions from competing for the CPU and the model
+        self.decoder_thread = threading.Thread(target=self.decoder_loop, daemon=True)
+        self.decoder_thread.start()
+        threading.Thread(target=self.output_loop, daemon=True).start()
+        self.debug_print("✓ Decoder started")
+
+    def decoder_loop(self):
+        """Decode audio blocks incrementally while recording is in progress"""
+        recognizer = None
+        pool = None
+        segments = []
+        decode_time = 0.0
+        segment_bytes = int(self.config["segment_max_seconds"] * 16000) * 2
+
+        while True:
+            kind, payload = self.decode_queue.get()
+
+            try:
+                if kind == 'start':
+                    grammar, audio_buffer = payload
+                    segments = []  # Finalized text not yet handed on
+                    emitted = 0
+                    undecoded = 0  # Bytes fed since the last finalized segment
+                    decode_time = 0.0
+                    last_partial_time = 0.0
+                    self.partial_text = ""
+                    # The pool itself is the readiness check: the model may finish loading
+                    # between these two lines
+                    pool = self.get_recognizer_pool(grammar)
+                    recognizer = pool.acquire() if pool is not None else None
+
+                elif kind == 'audio':
+                    if recognizer is not None:
+                        start_time = time.perf_counter()
+                        undecoded += len(payload)
+                        finished = None
+                        if recognizer.AcceptWaveform(payload):
+                            # Vosk ended a segment at a pause
+                            finished = json.loads(recognizer.Result()).get("text", "")
+                        elif undecoded >= segment_bytes:
+                            # Speech without a pause: end the segment anyway to bound memory
+                            finished = json.loads(recognizer.FinalResult()).get("text", "")
+                        elif start_time - last_partial_time >= 1 / self.config["animation_fps"]:
+                            # No point asking more often than the window can redraw
+                            last_partial_time = start_time
+                            partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                            self.partial_text = " ".join(filter(None, segments + [partial]))
+
+                        if finished is not None:
+                            # Everything fed so far is final; its audio isn't needed anymore
+                            audio_buffer.consume(undecoded)
+                            undecoded = 0
+                            if self.config["progressive_paste"] and finished:
+                                self.emit_segment(finished)
+                                emitted += 1
+                            else:
+                                segments.append(finished)
+                            self.partial_text = " ".join(filter(None, segments))
+                        decode_time += time.perf_counter() - start_time
+
+                elif kind == 'finish':
+                    audio_buffer, overflow, metrics = payload
+                    if emitted:
+                        metrics["segments"] = emitted
+                    if self.is_stale(metrics):
+                        # Cancelled with Escape while waiting; nothing left to finalize
+                        if recognizer is not None:
+                            pool.release(recognizer)
+                            recognizer = None
+                        self.finish_metrics(metrics, cancelled=True)
+                    elif recognizer is None or overflow:
+                        # Blocks were dropped (or no model at start): decode what isn't final yet
+                        self.debug_print("⚠ Stream incomplete, decoding remaining recording")
+                        if recognizer is not None:
+                            pool.release(recognizer)
+                            recognizer = None
+                        self.process_audio(audio_buffer, metrics, segments)
+                    else:
+                        start_time = time.perf_counter()
+                        segments.append(json.loads(recognizer.FinalResult()).get("text", ""))
+                        finalize_time = time.perf_counter() - start_time
+                        pool.release(recognizer)
+                        recognizer = None
+
+                        self.record_timing(metrics, audio_buffer.duration,
+                                           decode_time + finalize_time, finalize_time)
+                        self.debug_print("🔍 Finalized streaming transcription")
+                        self.handle_transcription(" ".join(filter(None, segments)), metrics)
+
+                elif kind == 'decode':
+                    # Whole-recording decode when streaming is off
+                    audio_buffer, metrics = payload
+                    if self.is_stale(metrics):
+                        self.finish_metrics(metrics, cancelled=True)
+                    else:
+                        self.process_audio(audio_buffer, metrics)
+
+                elif kind == 'cancel':
+                    if recognizer is not None:
+                        pool.release(recognizer)
+                        recognizer = None
+
+            except Exception as e:
+                # Drop the recognizer rather than returning it in an unknown state
+                recognizer = None
+                if kind in ('finish', 'decode'):
+                    self.finish_metrics(payload[-1])
+                self.debug_print(f"❌ Decoder error: {e}")
+                self.update_status("Error. Try again.", '#ff0000')
+                time.sleep(2)
+                self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+
+    def emit_segment(self, text):
+        """Queue a finalized segment to be pasted while recording continues"""
+        with self.job_lock:
+            self.pending_jobs += 1
+        # Trailing space so consecutive segments don't run together
+        self.output_queue.put((text + " ", {"_stopped": time.perf_counter(),
+                                            "_generation": self.job_generation,
+                                            "_segment": True}))
+
+    def get_recognizer_pool(self, grammar=None):
+        """Recognizers for a configured grammar, or for open dictation"""
+        return self.grammar_pools.get(grammar, self.recognizer_pool)
+
+    def record_timing(self, metrics, audio_seconds, decode_seconds, finalize_seconds):
+        """Add decode timings to an utterance's metrics"""
+        metrics.update({
+            "audio_s": round(audio_seconds, 3),
+            "acquire_ms": round(self.get_recognizer_pool(metrics.get("grammar")).last_acquire_ms, 2),
+            "decode_s": round(decode_seconds, 4),
+            "finalize_s": round(finalize_seconds, 4),
+            "rtf": round(decode_seconds / audio_seconds, 4) if audio_seconds else None,
+        })
+        self.debug_print(f"⏱ Utterance timing: {metrics}")
+
+    def is_stale(self, metrics):
+        """True if the utterance was cancelled with Escape after it was stopped"""
+        return metrics["_generation"] != self.job_generation
+
+    def finish_metrics(self, metrics, cancelled=False):
+        """Record an utterance's metrics once nothing more will be added"""
+        if cancelled:
+            metrics["cancelled"] = True
+        metrics.pop("_stopped", None)
+        metrics.pop("_generation", None)
+        # Re-pastes and progressive segments aren't utterances of their own
+        if not (metrics.pop("_repaste", False) or metrics.pop("_segment", False)):
+            self.last_metrics = metrics
+            self.metrics.record(metrics)
+
+        # The utterance has left the pipeline
+        with self.job_lock:
+            self.pending_jobs -= 1
+
+    def stream_block(self, block):
+        """Hand a captured int16 block to the streaming decoder without blocking"""
+        if self.stream_overflow:
+            return
+        if self.decode_queue.qsize() >= self.config["stream_queue_blocks"]:
+            # The decoder fell behind; the rest of the buffer is decoded on stop instead
+            self.stream_overflow = True
+            self.debug_print("⚠ Decoder queue full, falling back to full decode")
+            return
+        self.decode_queue.put(('audio', block))
 
     def setup_ui(self):
         """Create the compact interface"""
@@ -211,52 +1111,143 @@ class Chatty:
         self.text_label.pack(padx=8, pady=8)
 
     def audio_callback(self, indata, frames, time, status):
-        """Audio stream callback with animation data for different visual modes"""
-        if status:
-            self.debug_print(f"Audio stream error: {status}")
-
-        # Calculate audio levels
-        audio_data = np.frombuffer(indata, dtype=np.float32)
-        overall_level = np.sqrt(np.mean(audio_data**2)) * 200
+        """Real-time audio thread: only copy the block for the capture worker"""
+        if status and status.input_overflow:
+            # Samples were lost before this block; the block itself is still good
+            self.overrun_count += 1
+        if not self.capture_ring.put(indata):
+            # The capture worker fell 4 seconds behind
+            self.overrun_count += 1
+        self.capture_ready.set()
+
+    def capture_loop(self):
+        """Meter, buffer and stream captured blocks off the real-time audio thread"""
+        while True:
+            # Sleep until the callback delivers, then drain everything queued
+            self.capture_ready.wait()
+            self.capture_ready.clear()
+            block = self.capture_ring.peek()
+            while block is not None:
+                with self.capture_lock:
+                    self.process_block(block)
+                    reason, self.stop_reason = self.stop_reason, None
+                self.capture_ring.advance()
+                if reason:
+                    # Outside the lock: a Tk call from this thread waits for the Tk thread,
+                    # which may itself be waiting for capture_lock
+                    self.debug_print(reason)
+                    self.schedule(self.stop_recording)
+                block = self.capture_ring.peek()
+            with self.capture_drained:
+                self.capture_drained.notify_all()
+
+    def wait_for_capture(self, timeout=0.5):
+        """Wait until the capture worker has processed every block received so far"""
+        target = self.capture_ring.written
+        with self.capture_drained:
+            self.capture_drained.wait_for(lambda: self.capture_ring.read >= target, timeout)
+
+    def process_block(self, audio_data):
+        """Update levels and visuals for one block, keeping it if recording"""
+        # Band energies only drive the dots, so the FFT is skipped unless they're on screen
+        show_bands = self.recording and self.visual_mode == 'dots' and self.root is not None
+        # Calculate audio levels (level, peak and bands in one pass, no temporaries)
+        rms, peak = self.level_meter.process(audio_data, bands=show_bands)
+        overall_level = rms * 200
+        self.input_level = overall_level  # Reported to attached windows
+        if peak >= 0.999:
+            self.clipped_blocks += 1
 
         if self.recording:
-            self.audio_buffer.extend(audio_data)
-
-            if self.visual_mode == 'dots':
-                # Create different levels for each dot with some randomness
-                base_level = min(overall_level, 40)
-                for i in range(4):
-                    variation = random.uniform(0.7, 1.3)
-                    self.target_levels[i] = base_level * variation
+            self.keep_block(self.to_pcm(audio_data), rms)
+
+            if show_bands:
+                # Each dot follows the energy in its own frequency band
+                np.multiply(self.level_meter.bands, 200, out=self.target_levels)
+                np.minimum(self.target_levels, 40, out=self.target_levels)
             
             elif self.visual_mode == 'waveform':
                 # Add to waveform history
                 normalized_level = min(overall_level / 50.0, 1.0)  # Normalize to 0-1
-                self.waveform_history.append(normalized_level)
-                
-                # Keep only recent history
-                if len(self.waveform_history) > self.waveform_length:
-                    self.waveform_history.pop(0)
+                self.waveform_history.push(normalized_level)
+
+        elif self.preroll is not None:
+            # Remember the last moments before the hotkey, in case speech already began
+            self.preroll.append((self.to_pcm(audio_data), rms))
+
+    def to_pcm(self, audio_data):
+        """int16 PCM bytes of a captured block, as Vosk expects"""
+        if audio_data.dtype == np.int16:
+            # One copy out of the reused ring slot
+            return audio_data.tobytes()
+        # Clipped so loud input can't wrap around
+        return (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+    def keep_block(self, block, rms):
+        """Add a block to the recording, through voice activity detection if enabled"""
+        if self.vad is None:
+            self.store_block(block)
         else:
-            # Idle state
-            if self.visual_mode == 'dots':
-                # Minimal movement for dots
-                for i in range(4):
-                    self.target_levels[i] = random.uniform(0, 2)
-            
-            elif self.visual_mode == 'waveform':
-                # Add minimal noise to waveform
-                self.waveform_history.append(random.uniform(0, 0.1))
-                if len(self.waveform_history) > self.waveform_length:
-                    self.waveform_history.pop(0)
+            for kept in self.vad.process(block, rms):
+                self.store_block(kept)
+            if self.vad.should_stop():
+                self.request_stop("🤫 Trailing silence detected, stopping")
+
+    def store_block(self, block):
+        """Keep a captured block for this recording and pass it to the decoder"""
+        if self.audio_buffer.append(block):
+            if self.streaming:
+                self.stream_block(block)
+        else:
+            self.request_stop(f"⚠ Reached max_record_seconds ({self.config['max_record_seconds']}s), stopping")
+
+    def request_stop(self, reason):
+        """Ask for the recording to stop, at most once; capture_loop schedules it"""
+        if not self.stop_requested:
+            self.stop_requested = True
+            self.stop_reason = reason
 
     def setup_audio(self):
         """Initialize audio stream"""
+        block_size = 1000  # 62.5 ms at 16 kHz
+        self.block_size = block_size
+
+        # int16 capture is stored and decoded as is; float32 is converted per block
+        self.capture_dtype = self.config["capture_dtype"]
+        if self.capture_dtype not in ("int16", "float32"):
+            self.debug_print(f"⚠ Unknown capture_dtype '{self.capture_dtype}', using int16")
+            self.capture_dtype = "int16"
+        full_scale = 32768 if self.capture_dtype == "int16" else 1.0
+        self.level_meter = LevelMeter(block_size, full_scale=full_scale)
+
+        self.vad = None
+        if self.config["vad_enabled"]:
+            self.vad = VoiceActivityDetector(self.config["vad_threshold"],
+                                             block_ms=block_size / 16,
+                                             hangover_ms=self.config["vad_hangover_ms"],
+                                             auto_stop_ms=self.config["vad_auto_stop_ms"])
+            self.debug_print("✓ Voice activity detection enabled")
+
+        # The callback only fills this ring; everything else happens on the capture worker
+        self.capture_ring = BlockRing(64, block_size, dtype=self.capture_dtype)  # 4 seconds of slack
+
+        # Audio from just before recording starts, so the first word isn't clipped
+        preroll_blocks = math.ceil(self.config["preroll_ms"] * 16 / block_size)
+        self.preroll = deque(maxlen=preroll_blocks) if preroll_blocks > 0 else None
+        self.capture_lock = threading.Lock()
+        self.capture_ready = threading.Event()
+        self.capture_drained = threading.Condition()
+        threading.Thread(target=self.capture_loop, daemon=True).start()
+
+        self.open_audio_stream(block_size)
+
+    def open_audio_stream(self, block_size):
+        """Start feeding microphone blocks to audio_callback"""
         try:
             self.audio_stream = sd.RawInputStream(
                 samplerate=16000,
-                blocksize=1000,
-                dtype="float32",
+                blocksize=block_size,
+                dtype=self.capture_dtype,
                 channels=1,
                 callback=self.audio_callback
             )
@@ -265,40 +1256,119 @@ class Chatty:
         except Exception as e:
             self.debug_print(f"❌ Audio stream error: {e}")
 
-    def start_recording(self):
-        """Start audio recording"""
+    def start_recording(self, grammar=None):
+        """Start audio recording, optionally limited to one of the configured grammars"""
         if not self.recording:
-            self.recording = True
-            self.audio_buffer = []
-            self.update_status("Listening...", '#4A9EFF')  # Professional blue instead of green
-            self.debug_print("🎤 Recording started")
+            if self.pending_jobs >= self.config["max_pending_jobs"]:
+                # Back-pressure: don't pile up more audio than can be transcribed
+                self.update_status("Busy, still transcribing…", '#ffaa00')
+                self.debug_print(f"⚠ {self.pending_jobs} transcriptions pending, not recording")
+                return
+
+            with self.capture_lock:
+                self.audio_buffer = CaptureBuffer(self.config["max_record_seconds"])
+                self.stop_requested = False
+                self.stop_reason = None
+                self.partial_text = ""
+                self.record_start_time = time.perf_counter()
+                self.overrun_count = 0
+                self.clipped_blocks = 0
+                if self.vad is not None:
+                    self.vad.reset()
+                self.active_grammar = grammar
+                if self.streaming:
+                    self.stream_overflow = False
+                    self.decode_queue.put(('start', (grammar, self.audio_buffer)))
+                if self.preroll:
+                    for block, rms in self.preroll:
+                        self.keep_block(block, rms)
+                    self.preroll.clear()
+                self.recording = True
+            self.wake_animation()  # Full frame rate while recording
+            if grammar:
+                self.update_status(f"Listening ({grammar})...", '#4A9EFF')
+            else:
+                self.update_status("Listening...", '#4A9EFF')  # Professional blue instead of green
+            self.debug_print(f"🎤 Recording started{f' with grammar {grammar}' if grammar else ''}")
 
     def stop_recording(self):
         """Stop recording and process audio"""
         if self.recording:
-            self.recording = False
+            # Blocks captured before the key press still belong to this recording
+            now = time.perf_counter()
+            self.wait_for_capture()
+            with self.capture_lock:
+                self.recording = False
+
+                # Filled in as the utterance moves through decode, display and paste
+                metrics = {
+                    "timestamp": datetime.now().isoformat(timespec='seconds'),
+                    "capture_s": round(now - self.record_start_time, 3),
+                    "overruns": self.overrun_count,
+                    "clipped_blocks": self.clipped_blocks,
+                    "_stopped": now,
+                    "_generation": self.job_generation,
+                }
+                if self.active_grammar:
+                    metrics["grammar"] = self.active_grammar
+                with self.job_lock:
+                    self.pending_jobs += 1
+
+                if self.streaming:
+                    # Only the last partial chunk is left for the decoder to finalize
+                    self.decode_queue.put(('finish', (self.audio_buffer, self.stream_overflow,
+                                                      metrics)))
+                else:
+                    # Decoded in turn after any earlier recordings
+                    self.decode_queue.put(('decode', (self.audio_buffer, metrics)))
+
+            self.wake_animation()
             self.update_status("Processing...", '#ffaa00')
             self.debug_print("⏹️ Recording stopped")
 
-            # Process in separate thread
-            threading.Thread(target=self.process_audio, daemon=True).start()
+    def cancel_recording(self):
+        """Stop recording and discard the audio, or clear text not yet pasted"""
+        if self.recording:
+            with self.capture_lock:
+                self.recording = False
+                if self.streaming:
+                    self.decode_queue.put(('cancel', None))
+            self.wake_animation()
+            self.hide_partial()
+            self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+            self.debug_print("🚫 Recording cancelled")
+        elif self.text_visible or self.pending_jobs:
+            # Drop everything still waiting to be transcribed or pasted
+            self.job_generation += 1
+            self.clear_text()
+            self.hide_partial()
+            self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+            self.debug_print("🚫 Pending transcriptions cancelled")
 
-    def toggle_recording(self):
+    def toggle_recording(self, grammar=None):
         """Toggle recording state"""
         if self.recording:
             self.stop_recording()
         else:
-            self.start_recording()
+            self.start_recording(grammar)
 
-    def process_audio(self):
-        """Process recorded audio and transcribe"""
-        if not self.audio_buffer:
+    def process_audio(self, audio_buffer, metrics, segments=()):
+        """Process recorded audio and transcribe, after any segments already finalized"""
+        if not audio_buffer and not segments:
+            self.finish_metrics(metrics)
             self.update_status("Ctrl: start | Alt+V: visual", '#888888')
             self.debug_print("No audio recorded")
             return
 
+        # Recording may have started before the model finished loading
+        if not self.model_ready.is_set():
+            self.update_status("Loading model…", '#888888')
+            self.model_ready.wait()
+            self.update_status("Processing...", '#ffaa00')
+
         # Check if model is loaded
         if self.model is None:
+            self.finish_metrics(metrics)
             self.debug_print("❌ Cannot transcribe: Model not loaded")
             self.update_status("Model not loaded!", '#ff0000')
             time.sleep(2)
@@ -307,88 +1377,181 @@ class Chatty:
 
         self.debug_print("🔍 Transcribing...")
 
-        # Convert to format expected by Vosk
-        audio_array = np.array(self.audio_buffer, dtype=np.float32)
-        audio_data = (audio_array * 32768).astype(np.int16).tobytes()
+        # Already int16 PCM, the format expected by Vosk
+        audio_data = audio_buffer.getvalue()
 
-        # Create recognizer for this session
-        recognizer = KaldiRecognizer(self.model, 16000)
+        # Take a ready recognizer for this session
+        pool = self.get_recognizer_pool(metrics.get("grammar"))
+        recognizer = pool.acquire()
 
         try:
             # Process audio
+            start_time = time.perf_counter()
+            segments = list(segments)
             if recognizer.AcceptWaveform(audio_data):
-                result = recognizer.Result()
-                text = json.loads(result).get("text", "")
-            else:
-                result = recognizer.FinalResult()
-                text = json.loads(result).get("text", "")
+                segments.append(json.loads(recognizer.Result()).get("text", ""))
+            segments.append(json.loads(recognizer.FinalResult()).get("text", ""))
+            decode_time = time.perf_counter() - start_time
+            pool.release(recognizer)
 
-            if text.strip():
-                final_text = text.strip()
-                self.debug_print(f"📝 Transcribed: '{final_text}'")
-
-                # Show the transcribed text and auto-copy
-                self.show_text(final_text)
-                self.update_status("Auto-copying...", '#ffaa00')
-                # Auto-copy after a brief delay to show the text
-                threading.Thread(target=self.auto_copy_after_delay, daemon=True).start()
-
-            else:
-                self.debug_print("🔇 No speech detected")
-                self.update_status("No speech. Try again.", '#ff6600')
-                time.sleep(2)
-                self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+            self.record_timing(metrics, audio_buffer.duration, decode_time, decode_time)
+            self.handle_transcription(" ".join(filter(None, segments)), metrics)
 
         except Exception as e:
+            self.finish_metrics(metrics)
             self.debug_print(f"❌ Transcription error: {e}")
             self.update_status("Error. Try again.", '#ff0000')
             time.sleep(2)
             self.update_status("Ctrl: start | Alt+V: visual", '#888888')
 
+    def handle_transcription(self, text, metrics):
+        """Queue a finished transcription to be shown and pasted after earlier ones"""
+        # Hotkey-to-text latency: from stopping the recording until the text is ready
+        metrics["latency_s"] = round(time.perf_counter() - metrics["_stopped"], 4)
+        self.output_queue.put((text.strip(), metrics))
+
+    def save_history(self, text):
+        """Append a transcription to the history without letting errors stop output"""
+        try:
+            self.history.add(text)
+        except Exception as e:
+            self.debug_print(f"⚠ Could not save to history: {e}")
+
+    def repaste_last(self):
+        """Queue the most recent transcription from the history to be pasted again"""
+        entries = self.history.search(limit=1) if self.history is not None else []
+        if not entries:
+            self.update_status("No history yet", '#ff6600')
+            return
+
+        with self.job_lock:
+            self.pending_jobs += 1
+        metrics = {"_stopped": time.perf_counter(), "_generation": self.job_generation,
+                   "_repaste": True}
+        self.output_queue.put((entries[0][2], metrics))
+        self.debug_print(f"🔁 Re-pasting history entry {entries[0][0]}")
+
+    def next_output(self, timeout):
+        """Wait up to timeout seconds for the next transcription to show"""
+        try:
+            return self.output_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def output_loop(self):
+        """Show and paste transcriptions one at a time, in the order they were spoken"""
+        job = None
+        while True:
+            text, metrics = job or self.output_queue.get()
+            job = None
+
+            # Saved even if cancelled below, so the text can still be recovered
+            if text and self.history is not None and not metrics.get("_repaste"):
+                self.save_history(text)
+
+            if self.is_stale(metrics):
+                self.finish_metrics(metrics, cancelled=True)
+                continue
+
+            if not text and metrics.get("segments"):
+                # Everything was already pasted segment by segment
+                self.finish_metrics(metrics)
+                if not self.recording:
+                    self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+                continue
+
+            if not text:
+                self.finish_metrics(metrics)
+                self.debug_print("🔇 No speech detected")
+                self.schedule(self.hide_partial)
+                self.update_status("No speech. Try again.", '#ff6600')
+                job = self.next_output(2)
+                if job is None and not self.recording:
+                    self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+                continue
+
+            self.debug_print(f"📝 Transcribed: '{text}'")
+            self.show_text(text)
+            self.update_status("Auto-copying...", '#ffaa00')
+
+            # Show the text briefly; Escape in the meantime cancels the paste.
+            # Progressive segments go out right away so they keep up with speech
+            if not metrics.get("_segment"):
+                time.sleep(self.config["show_text_seconds"])
+            if self.is_stale(metrics):
+                self.finish_metrics(metrics, cancelled=True)
+                continue
+
+            if self.copy_to_cursor(metrics):
+                # Keep the text up a moment, unless the next transcription is already waiting
+                job = self.next_output(self.config["clear_after_seconds"])
+                if job is None:
+                    self.clear_text()
+
+    def update_partial_display(self):
+        """Show the words recognized so far while recording"""
+        text = self.partial_text
+        if text == self.shown_partial:
+            return
+        self.shown_partial = text
+        if text:
+            # Long dictations only show their latest words
+            if len(text) > 200:
+                text = "…" + text[-200:].split(" ", 1)[-1]
+            # Dimmer than a finished transcription
+            self.text_label.configure(text=text, fg='#aaaaaa')
+            self.text_frame.pack(fill='x', pady=(0, 5))
+
+    def hide_partial(self):
+        """Remove partial text that never turned into a transcription"""
+        self.shown_partial = ""
+        if self.root is not None and not self.text_visible:
+            self.text_frame.pack_forget()
+
     def show_text(self, text):
         """Display transcribed text"""
         self.current_text = text
         self.text_visible = True
-        self.text_label.configure(text=text)
-        self.text_frame.pack(fill='x', pady=(0, 5))
+        if self.root is not None:
+            self.text_label.configure(text=text, fg='#ffffff')
+            self.text_frame.pack(fill='x', pady=(0, 5))
 
     def clear_text(self):
         """Clear the displayed text"""
         self.text_visible = False
         self.current_text = ""
-        self.text_frame.pack_forget()
-        self.update_status("Ctrl: start | Alt+V: visual", '#888888')
+        if self.root is not None:
+            self.text_frame.pack_forget()
+        if not self.recording:
+            self.update_status("Ctrl: start | Alt+V: visual", '#888888')
         self.debug_print("🗑️ Text cleared")
 
-    def auto_copy_after_delay(self):
-        """Auto-copy text after showing it briefly"""
-        time.sleep(1.5)  # Show text for 1.5 seconds
-        if self.text_visible:  # Only if text is still visible (not cancelled)
-            self.copy_to_cursor()
-
-    def copy_to_cursor(self):
-        """Copy text to cursor location"""
+    def copy_to_cursor(self, metrics):
+        """Copy text to cursor location, returning True once it has been pasted"""
+        pasted = False
         if self.current_text:
             try:
                 # Copy to clipboard first
                 pyperclip.copy(self.current_text)
                 self.debug_print(f"📋 Copied to clipboard: '{self.current_text}'")
 
-                # Simple approach: just type the text directly
                 # Give a small delay to ensure our window isn't capturing the keystroke
-                time.sleep(0.3)
+                time.sleep(self.config["paste_delay_seconds"])
 
-                # Type the text character by character for better reliability
-                subprocess.run(['xdotool', 'type', '--delay', '50', self.current_text], check=True)
+                # Synthesized keys must not be mistaken for the recording hotkey
+                self.suppress_hotkeys_until = float('inf')
+                paste_start = time.perf_counter()
+                try:
+                    self.output_backend.output(self.current_text)
+                finally:
+                    self.suppress_hotkeys_until = time.time() + 0.2
+                metrics["paste_s"] = round(time.perf_counter() - paste_start, 4)
 
                 self.debug_print("✓ Text pasted to cursor location")
                 self.update_status("Text pasted!", '#4A9EFF')  # Use blue instead of green
+                pasted = True
 
-                # Clear after successful copy
-                time.sleep(1)
-                self.clear_text()
-
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, FileNotFoundError) as e:
                 self.debug_print(f"❌ xdotool failed: {e}")
                 # Fallback: just keep in clipboard
                 try:
@@ -403,9 +1566,17 @@ class Chatty:
                 self.debug_print(f"❌ Unexpected error: {e}")
                 self.update_status("Error - text copied to clipboard", '#ff6600')
 
+        self.finish_metrics(metrics)
+        return pasted
+
     def update_status(self, text, color='#888888'):
         """Update status display"""
-        self.status_label.configure(text=text, fg=color)
+        self.status_text = text
+        self.status_color = color
+        if self.root is not None:
+            self.status_label.configure(text=text, fg=color)
+        else:
+            self.debug_print(f"ℹ Status: {text}")
 
     def cycle_visual_mode(self):
         """Cycle to the next visual mode"""
@@ -414,22 +1585,60 @@ class Chatty:
         
         # Reset visualization data when switching modes
         if self.visual_mode == 'waveform':
-            self.waveform_history = []
+            self.waveform_history.clear()
         elif self.visual_mode == 'dots':
             self.audio_levels = [0, 0, 0, 0]
-            self.target_levels = [0, 0, 0, 0]
+            self.target_levels[:] = 0
         
         # Update status to show current mode
         mode_name = self.visual_mode.capitalize()
         self.update_status(f"Visual: {mode_name}", '#4A9EFF')
+        self.wake_animation()
         self.debug_print(f"🎨 Switched to {mode_name} mode")
         
         # Return to normal status after showing mode
-        self.root.after(2000, lambda: self.update_status("Ctrl: start | Alt+V: visual", '#888888'))
+        self.schedule(lambda: self.update_status("Ctrl: start | Alt+V: visual", '#888888'), 2000)
+
+    def build_canvas_items(self):
+        """Create the canvas items for the current visual mode once"""
+        self.dots_canvas.delete("all")
+        self.canvas_items = {}
+        self.canvas_states = {}
+        self.canvas_mode = self.visual_mode
+        self.canvas_recording = None  # Forces the first frame to apply colors
+
+        if self.visual_mode == 'dots':
+            # Glow ring and filled dot for each of the 4 dots
+            self.canvas_items['dots'] = [
+                (self.dots_canvas.create_oval(0, 0, 0, 0, fill='', width=1),
+                 self.dots_canvas.create_oval(0, 0, 0, 0, outline=''))
+                for _ in range(4)
+            ]
+
+        elif self.visual_mode == 'waveform':
+            # Glow line first so it stays behind the main line
+            self.canvas_items['glow'] = self.dots_canvas.create_line(
+                0, 0, 0, 0, smooth=True, capstyle='round')
+            self.canvas_items['line'] = self.dots_canvas.create_line(
+                0, 0, 0, 0, smooth=True, capstyle='round')
+            self.canvas_items['particles'] = [
+                self.dots_canvas.create_oval(0, 0, 0, 0, fill='#4A9EFF', outline='',
+                                             stipple='gray25')
+                for _ in range(3)
+            ]
+            for item in [self.canvas_items['glow'], self.canvas_items['line']] + self.canvas_items['particles']:
+                self.set_canvas_state(item, 'hidden')
+
+    def set_canvas_state(self, item, state):
+        """Show or hide a canvas item, skipping the Tk call if nothing changes"""
+        if self.canvas_states.get(item, 'normal') != state:
+            self.canvas_states[item] = state
+            self.dots_canvas.itemconfig(item, state=state)
 
     def draw_animated_dots(self):
         """Draw compact animated dots"""
-        self.dots_canvas.delete("all")
+        if self.canvas_mode != 'dots':
+            self.build_canvas_items()
 
         canvas_width = 120
         canvas_height = 40
@@ -439,7 +1648,15 @@ class Chatty:
         dot_spacing = 20
         start_x = (canvas_width - (3 * dot_spacing)) // 2
 
-        for i in range(4):
+        # Colors only change with the recording state
+        if self.canvas_recording != self.recording:
+            self.canvas_recording = self.recording
+            color = '#4A9EFF' if self.recording else '#666666'  # Blue when recording, gray when idle
+            for glow, dot in self.canvas_items['dots']:
+                self.dots_canvas.itemconfig(glow, outline=color)
+                self.dots_canvas.itemconfig(dot, fill=color)
+
+        for i, (glow, dot) in enumerate(self.canvas_items['dots']):
             # Smooth animation towards target
             self.audio_levels[i] += (self.target_levels[i] - self.audio_levels[i]) * 0.15
 
@@ -459,138 +1676,205 @@ class Chatty:
             else:
                 radius = base_radius + math.sin((self.frame_count + i * 30) * 0.1) * 0.3
 
-            # Color based on state
-            if self.recording:
-                color = '#4A9EFF'  # Professional blue when recording
-            else:
-                color = '#666666'  # Gray when idle
-
-            # Draw dot with subtle glow effect
-            self.dots_canvas.create_oval(
-                x - radius - 1, y - radius - 1,
-                x + radius + 1, y + radius + 1,
-                fill='', outline=color, width=1
-            )
-
-            self.dots_canvas.create_oval(
-                x - radius, y - radius,
-                x + radius, y + radius,
-                fill=color, outline=''
-            )
+            # Move the dot and its subtle glow ring
+            self.dots_canvas.coords(glow, x - radius - 1, y - radius - 1,
+                                    x + radius + 1, y + radius + 1)
+            self.dots_canvas.coords(dot, x - radius, y - radius, x + radius, y + radius)
 
     def draw_waveform(self):
         """Draw flowing waveform visualization"""
-        self.dots_canvas.delete("all")
+        if self.canvas_mode != 'waveform':
+            self.build_canvas_items()
 
         canvas_width = 120
         canvas_height = 40
         center_y = canvas_height // 2
 
-        if not self.waveform_history:
-            return
+        line = self.canvas_items['line']
+        glow = self.canvas_items['glow']
+        particles = self.canvas_items['particles']
 
-        # Create flowing waveform based on audio history
+        # One consistent copy of the history; the audio thread keeps writing
+        history = self.waveform_history.snapshot(self.waveform_length)
+
+        # Idle shows a calm baseline; the flow animation keeps it moving gently
+        levels = history[-30:] if self.recording else self.idle_waveform  # Limit points for smooth curves
+        num_points = len(levels)
+
+        # Create flowing waveform based on audio history, all points at once
         points = []
-        num_points = min(len(self.waveform_history), 30)  # Limit points for smooth curves
-        
-        for i in range(num_points):
-            # X position spreads across canvas width
-            x = (i / max(num_points - 1, 1)) * canvas_width
-            
-            # Y position based on audio level with some animation
-            history_index = len(self.waveform_history) - num_points + i
-            if history_index >= 0:
-                level = self.waveform_history[history_index]
-                
-                # Add flowing animation
-                flow_offset = math.sin((self.frame_count * 0.1) + (i * 0.5)) * 0.1
-                level = max(0, min(1, level + flow_offset))
-                
-                # Convert to canvas coordinates
-                amplitude = level * (canvas_height * 0.4)  # Use 40% of canvas height
-                y = center_y + math.sin((x * 0.1) + (self.frame_count * 0.05)) * amplitude
-            else:
-                y = center_y
-            
-            points.extend([x, y])
+        if num_points >= 2:
+            i = self.waveform_index[:num_points]
+
+            # X positions spread across canvas width
+            x = i * (canvas_width / (num_points - 1))
+
+            # Audio level with flowing animation, converted to canvas coordinates
+            level = np.clip(levels + np.sin((self.frame_count * 0.1) + (i * 0.5)) * 0.1, 0, 1)
+            amplitude = level * (canvas_height * 0.4)  # Use 40% of canvas height
+            y = center_y + np.sin((x * 0.1) + (self.frame_count * 0.05)) * amplitude
+
+            points = np.column_stack((x, y)).ravel().tolist()
 
         # Draw the waveform as a smooth curve
         if len(points) >= 4:  # Need at least 2 points (4 coordinates)
-            # Color based on state
+            # Restyle only when the recording state changes
+            if self.canvas_recording != self.recording:
+                self.canvas_recording = self.recording
+                if self.recording:
+                    color = '#4A9EFF'  # Professional blue when recording
+                    line_width = 2
+                else:
+                    color = '#666666'  # Gray when idle
+                    line_width = 1
+
+                self.dots_canvas.itemconfig(line, fill=color, width=line_width)
+                self.dots_canvas.itemconfig(glow, fill=color, width=line_width + 1)
+
+            self.dots_canvas.coords(line, points)
+            self.set_canvas_state(line, 'normal')
+            # Subtle glow underneath the main line, only when recording
             if self.recording:
-                color = '#4A9EFF'  # Professional blue when recording
-                line_width = 2
+                self.dots_canvas.coords(glow, points)
+                self.set_canvas_state(glow, 'normal')
             else:
-                color = '#666666'  # Gray when idle
-                line_width = 1
-
-            # Draw the main waveform line
-            self.dots_canvas.create_line(
-                points,
-                fill=color,
-                width=line_width,
-                smooth=True,
-                capstyle='round'
-            )
-
-            # Add a subtle glow effect when recording
-            if self.recording and len(points) >= 4:
-                # Draw a slightly thicker line underneath for glow
-                self.dots_canvas.create_line(
-                    points,
-                    fill=color,
-                    width=line_width + 1,
-                    smooth=True,
-                    capstyle='round',
-                    state='disabled'  # Draw behind main line
-                )
+                self.set_canvas_state(glow, 'hidden')
+        else:
+            self.set_canvas_state(line, 'hidden')
+            self.set_canvas_state(glow, 'hidden')
 
         # Add some flowing particles for extra effect when recording
-        if self.recording and len(self.waveform_history) > 5:
-            for i in range(3):  # 3 flowing particles
-                particle_x = ((self.frame_count + i * 40) % 150) * (canvas_width / 150)
+        show_particles = self.recording and len(history) > 5
+        for i, particle in enumerate(particles):
+            if not show_particles:
+                self.set_canvas_state(particle, 'hidden')
+                continue
+
+            particle_x = ((self.frame_count + i * 40) % 150) * (canvas_width / 150)
+            
+            # Get amplitude at this x position
+            history_pos = int((particle_x / canvas_width) * len(history))
+            if 0 <= history_pos < len(history):
+                level = history[history_pos]
+                particle_y = center_y + math.sin(particle_x * 0.1) * (level * canvas_height * 0.3)
                 
-                # Get amplitude at this x position
-                history_pos = int((particle_x / canvas_width) * len(self.waveform_history))
-                if 0 <= history_pos < len(self.waveform_history):
-                    level = self.waveform_history[history_pos]
-                    particle_y = center_y + math.sin(particle_x * 0.1) * (level * canvas_height * 0.3)
-                    
-                    # Draw small particle
-                    self.dots_canvas.create_oval(
-                        particle_x - 1, particle_y - 1,
-                        particle_x + 1, particle_y + 1,
-                        fill='#4A9EFF', outline='', stipple='gray25'
-                    )
+                # Move small particle
+                self.dots_canvas.coords(particle, particle_x - 1, particle_y - 1,
+                                        particle_x + 1, particle_y + 1)
+                self.set_canvas_state(particle, 'normal')
+            else:
+                self.set_canvas_state(particle, 'hidden')
 
     def animate(self):
         """Main animation loop"""
-        if self.animation_running:
-            self.frame_count += 1
-            
-            # Draw appropriate visualization based on current mode
-            if self.visual_mode == 'dots':
-                self.draw_animated_dots()
-            elif self.visual_mode == 'waveform':
-                self.draw_waveform()
-            
-            self.root.after(50, self.animate)  # 20 FPS
+        self.animation_after_id = None
+        if not self.animation_running:
+            return
+
+        # Advance in 20 FPS frame units so motion speed doesn't depend on the frame rate
+        now = time.time()
+        if self.last_frame_time is not None:
+            self.frame_count += min(now - self.last_frame_time, 0.5) * 20
+        self.last_frame_time = now
+
+        if self.recording:
+            self.update_partial_display()
+
+        # Draw appropriate visualization based on current mode
+        if self.visual_mode == 'dots':
+            self.draw_animated_dots()
+        elif self.visual_mode == 'waveform':
+            self.draw_waveform()
+
+        fps = self.get_target_fps()
+        if fps > 0:
+            self.animation_after_id = self.root.after(int(1000 / fps), self.animate)
+        else:
+            # Paused until wake_animation is called
+            self.last_frame_time = None
+
+    def get_target_fps(self):
+        """Pick the frame rate for the current recording and window state"""
+        if self.recording:
+            return self.config["animation_fps"]
+        if not self.window_visible:
+            return 0
+        if self.window_focused:
+            return self.config["animation_fps"]
+        return self.config["idle_fps"]
+
+    def wake_animation(self):
+        """Redraw now and reschedule at the rate the new state calls for"""
+        if self.root is None:
+            return
+        if self.animation_after_id is not None:
+            self.root.after_cancel(self.animation_after_id)
+        self.animation_after_id = self.root.after(0, self.animate)
+
+    def on_window_state(self, focused=None, visible=None):
+        """Track focus and visibility changes that affect the frame rate"""
+        if focused is not None:
+            self.window_focused = focused
+        if visible is not None:
+            self.window_visible = visible
+        self.wake_animation()
 
     def start_animation(self):
         """Start the animation loop"""
+        # Slow down or pause when nobody can see or is using the window
+        self.bind_window_state('<FocusIn>', focused=True)
+        self.bind_window_state('<FocusOut>', focused=False)
+        self.bind_window_state('<Map>', visible=True)
+        self.bind_window_state('<Unmap>', visible=False)
+        self.dots_canvas.bind('<Visibility>', lambda e: self.on_window_state(
+            visible=e.state != 'VisibilityFullyObscured'))
         self.animate()
 
+    def bind_window_state(self, sequence, **state):
+        """Track an event on the window itself, ignoring the same event from its children"""
+        def handler(event):
+            # Child widgets also reach this binding, e.g. pack_forget() unmaps text_frame
+            if event.widget is self.root:
+                self.on_window_state(**state)
+        self.root.bind(sequence, handler)
+
+    def get_grammar_keys(self, hotkey_keys):
+        """Map each grammar hotkey's key constants to the grammar it records with"""
+        grammar_keys = {}
+        for hotkey, grammar in self.config["grammar_hotkeys"].items():
+            if grammar not in self.config["grammars"]:
+                self.debug_print(f"⚠ Hotkey '{hotkey}' uses unknown grammar '{grammar}', ignoring")
+                continue
+            # No fallback to ctrl: one press must never toggle two recordings
+            keys = self.get_hotkey_keys(hotkey, fallback=False)
+            if not keys:
+                self.debug_print(f"⚠ Unknown grammar hotkey '{hotkey}', ignoring")
+                continue
+            if any(key in hotkey_keys or key in grammar_keys for key in keys):
+                self.debug_print(f"⚠ Grammar hotkey '{hotkey}' is already in use, ignoring")
+                continue
+            for key in keys:
+                grammar_keys[key] = grammar
+        return grammar_keys
+
     def setup_hotkeys(self):
         """Setup global hotkey listener"""
         hotkey_keys = self.get_hotkey_keys()
+        grammar_keys = self.get_grammar_keys(hotkey_keys)
         
         def on_key_press(key):
             try:
-                # Configured hotkey press
-                if key in hotkey_keys:
+                # Configured hotkey press (ignored while we synthesize output keys)
+                if key in hotkey_keys and time.time() >= self.suppress_hotkeys_until:
                     if not self.hotkey_pressed:
                         self.hotkey_pressed = True
-                        self.root.after(0, self.toggle_recording)
+                        self.schedule(self.toggle_recording)
+
+                # Grammar hotkeys record a command phrase instead of free dictation
+                if key in grammar_keys and time.time() >= self.suppress_hotkeys_until:
+                    if not self.grammar_key_pressed:
+                        self.grammar_key_pressed = True
+                        self.schedule(lambda: self.toggle_recording(grammar_keys[key]))
 
                 # Alt key press (for visual mode cycling)
                 if key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
@@ -599,13 +1883,18 @@ class Chatty:
 
                 # V key (with Alt) for visual mode cycling
                 if hasattr(key, 'char') and key.char == 'v' and self.alt_pressed:
-                    self.root.after(0, self.cycle_visual_mode)
+                    self.schedule(self.cycle_visual_mode)
+
+                # R key (with Alt) pastes the last transcription again
+                if hasattr(key, 'char') and key.char == 'r' and self.alt_pressed:
+                    self.schedule(self.repaste_last)
 
                 # Escape key
                 if key == keyboard.Key.esc and not self.escape_pressed:
                     self.escape_pressed = True
-                    if self.text_visible:
-                        self.root.after(0, self.clear_text)
+                    # Cancels a recording in progress or transcriptions not yet pasted
+                    if self.recording or self.text_visible or self.pending_jobs:
+                        self.schedule(self.cancel_recording)
 
             except AttributeError:
                 pass
@@ -615,6 +1904,8 @@ class Chatty:
                 # Release configured hotkey
                 if key in hotkey_keys:
                     self.hotkey_pressed = False
+                if key in grammar_keys:
+                    self.grammar_key_pressed = False
 
                 # Release Alt key
                 if key == keyboard.Key.alt_l or key == keyboard.Key.alt_r:
@@ -638,6 +1929,87 @@ class Chatty:
             self.debug_print(f"⚠️ Could not start hotkey listener: {e}")
             # Continue without hotkeys in test environments
 
+    def get_state(self):
+        """Snapshot of the current state for control clients"""
+        return {
+            "recording": self.recording,
+            "model_ready": self.model_ready.is_set() and self.model is not None,
+            "status": self.status_text,
+            "status_color": self.status_color,
+            "level": round(self.input_level, 2),
+            "partial": self.partial_text if self.recording else "",
+            "text": self.current_text,
+        }
+
+    async def start_control_server(self):
+        """Listen for start/stop/toggle/cancel/status commands on a Unix socket"""
+        self.control_commands = {
+            "start": self.start_recording,
+            "stop": self.stop_recording,
+            "toggle": self.toggle_recording,
+            "cancel": self.cancel_recording,
+            "status": None,
+            "stats": None,
+        }
+        path = get_control_socket_path(self.config)
+        if socket_in_use(path):
+            raise RuntimeError(f"Another Chatty is already listening on {path}")
+
+        # Clear out a socket file left behind by a previous run
+        if os.path.exists(path):
+            os.unlink(path)
+        self.control_server = await asyncio.start_unix_server(self.handle_control_client, path=path)
+        os.chmod(path, 0o600)
+        self.debug_print(f"✓ Control socket listening on {path}")
+
+    async def handle_control_client(self, reader, writer):
+        """Serve newline-separated commands, replying with one JSON line each"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                command = line.decode().strip().lower()
+                if command not in self.control_commands:
+                    reply = {"ok": False, "error": f"unknown command '{command}'"}
+                else:
+                    action = self.control_commands[command]
+                    if action is not None:
+                        await self.run_on_main(action)
+                    reply = {"ok": True, **self.get_state()}
+                    if command == "stats":
+                        reply["stats"] = self.metrics.summary()
+
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def run_on_main(self, action):
+        """Run an action on the thread that owns Chatty's state and wait for it"""
+        if self.root is None:
+            # Headless: the event loop thread is the main thread
+            action()
+            return
+
+        done = asyncio.get_running_loop().create_future()
+        def run():
+            action()
+            done.get_loop().call_soon_threadsafe(done.set_result, None)
+        self.root.after(0, run)
+        await done
+
+    def run_control_loop(self):
+        """Serve the control socket from a background thread (GUI mode)"""
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.loop.run_until_complete(self.start_control_server())
+        except RuntimeError as e:
+            self.debug_print(f"⚠ {e}")
+            return
+        self.loop.run_forever()
+
     def on_closing(self):
         """Handle window closing"""
         self.animation_running = False
@@ -649,7 +2021,393 @@ class Chatty:
                 self.keyboard_listener.stop()
             except:
                 pass  # May fail in test environments
-        self.root.destroy()
+        if self.control_server is not None:
+            if self.root is None:
+                self.control_server.close()
+            try:
+                os.unlink(get_control_socket_path(self.config))
+            except OSError:
+                pass
+        if self.root is not None:
+            self.root.destroy()
+
+class ChattyClient(Chatty):
+    """Window attached to a headless Chatty, which keeps the microphone, model and hotkeys"""
+
+    def __init__(self, root, socket_path, debug_mode=False):
+        self.socket_path = socket_path
+        self.daemon_status = None
+        super().__init__(root, debug_mode=debug_mode)
+        threading.Thread(target=self.poll_daemon, daemon=True).start()
+
+    def setup_output(self):
+        self.metrics = None
+        self.history = None
+
+    def setup_model(self):
+        self.model = None
+        self.model_ready = threading.Event()
+
+    def setup_decoder(self):
+        pass
+
+    def setup_audio(self):
+        pass
+
+    def setup_hotkeys(self):
+        # The daemon handles the global hotkeys; Alt+V only changes this window
+        self.root.bind('<Alt-v>', lambda e: self.cycle_visual_mode())
+
+    def poll_daemon(self):
+        """Fetch the daemon's state over the control socket, faster while it records"""
+        while self.animation_running:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                    client.connect(self.socket_path)
+                    reader = client.makefile('r')
+                    while self.animation_running:
+                        client.sendall(b"status\n")
+                        state = json.loads(reader.readline())
+                        self.schedule(lambda state=state: self.apply_state(state))
+                        time.sleep(1 / self.config["animation_fps"] if state["recording"] else 0.2)
+            except (OSError, ValueError) as e:
+                self.debug_print(f"⚠ Lost connection to Chatty daemon: {e}")
+                self.daemon_status = None
+                self.schedule(lambda: self.update_status("Daemon not running", '#ff6600'))
+                time.sleep(1)
+
+    def apply_state(self, state):
+        """Mirror the daemon's recording state, levels and text in the window"""
+        was_recording = self.recording
+        self.recording = state["recording"]
+        self.partial_text = state["partial"]
+        if self.recording:
+            # One overall level instead of per-band levels
+            self.target_levels[:] = min(state["level"], 40)
+            self.waveform_history.push(min(state["level"] / 50.0, 1.0))
+
+        if state["text"] and state["text"] != self.current_text:
+            self.show_text(state["text"])
+        elif not state["text"] and self.text_visible:
+            self.clear_text()
+        elif was_recording and not self.recording:
+            self.hide_partial()
+
+        # Only on change, so local messages like the visual mode stay up
+        if state["status"] != self.daemon_status:
+            self.daemon_status = state["status"]
+            self.update_status(state["status"], state["status_color"])
+        if self.recording != was_recording:
+            self.wake_animation()
+
+def get_project_root():
+    """Directory containing src/, config.json and vosk_model/"""
+    # Get the directory where this script is located
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    # Get the project root (parent directory of src)
+    return os.path.dirname(script_dir)
+
+def load_config_file():
+    """Read config.json from the project root, or return {} if there is none"""
+    config_path = os.path.join(get_project_root(), "config.json")
+    if not os.path.exists(config_path):
+        return {}
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+def get_model_path(config):
+    """Absolute path of the configured Vosk model, defaulting to the bundled one"""
+    model_path = config.get("model_path") or os.path.join("vosk_model", "vosk-model-small-en-us-0.15")
+    # Relative paths are resolved against the project root
+    return os.path.join(get_project_root(), os.path.expanduser(model_path))
+
+def load_metrics_summary(path):
+    """Summarize the utterance records in a metrics JSONL file"""
+    records = []
+    with open(os.path.expanduser(path)) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # Blank, or cut short while Chatty was writing it
+    return summarize_metrics(records)
+
+def get_history_path(config):
+    """Transcript history database, in the user's data directory by default"""
+    return os.path.expanduser(config.get("history_file") or "~/.local/share/chatty/history.db")
+
+def run_history(query, limit=20, paste_id=None, paste_delay=None):
+    """Print matching history entries, or copy one of them again"""
+    config = load_config_file()
+    history = TranscriptHistory(get_history_path(config))
+
+    if paste_id is not None:
+        entry = history.get(paste_id)
+        if entry is None:
+            print(f"❌ No history entry {paste_id}", file=sys.stderr)
+            return False
+        pyperclip.copy(entry[2])
+        if paste_delay is None:
+            # Pasting now would go to this terminal, where Ctrl+V usually does nothing
+            print(f"📋 Copied entry {paste_id} to the clipboard")
+            return True
+
+        print(f"📋 Pasting entry {paste_id} in {paste_delay:g}s, switch to the target window")
+        time.sleep(paste_delay)
+        backend = OUTPUT_BACKENDS.get(config.get("output_backend", "clipboard"), ClipboardPasteOutput)
+        backend({"paste_keys": "ctrl+v", "type_delay_ms": 0, **config}).output(entry[2])
+        return True
+
+    for entry_id, created, text in reversed(history.search(query, limit)):
+        print(f"{entry_id:6}  {created}  {text}")
+    return True
+
+def get_model_host_socket(config):
+    """Socket shared by every user's Chatty to reach the model host"""
+    # Under /run so ordinary users can't bind it before the real host does
+    return os.path.expanduser(config.get("model_host_socket") or "/run/chatty/model.sock")
+
+def get_model_host_uids(config):
+    """Users trusted to run the model host: root, yourself and "model_host_user" """
+    uids = {0, os.getuid()}
+    user = config.get("model_host_user")
+    if isinstance(user, int):
+        uids.add(user)
+    elif user:
+        import pwd
+        uids.add(pwd.getpwnam(user).pw_uid)  # KeyError for unknown users
+    return uids
+
+class ModelHost:
+    """Loads the model once and decodes for any number of Chatty clients"""
+
+    def __init__(self, model, debug_mode=False):
+        self.model = model
+        self.debug_mode = debug_mode
+
+    def debug_print(self, message):
+        if self.debug_mode:
+            print(message)
+
+    async def handle_client(self, reader, writer):
+        """Run one client's recognizer, answering each request frame in order"""
+        loop = asyncio.get_running_loop()
+        recognizer = None
+        try:
+            while True:
+                header = await reader.readexactly(5)
+                op = header[:1]
+                payload = await reader.readexactly(int.from_bytes(header[1:], 'big'))
+
+                try:
+                    # Decoding happens in worker threads so clients run in parallel
+                    if op == b'N':
+                        request = json.loads(payload)
+                        recognizer = await loop.run_in_executor(
+                            None, new_recognizer, self.model, request["sample_rate"],
+                            request.get("grammar"))
+                        reply = b''
+                    elif op == b'A':
+                        accepted = await loop.run_in_executor(None, recognizer.AcceptWaveform, payload)
+                        reply = b'1' if accepted else b'0'
+                    elif op == b'R':
+                        reply = recognizer.Result().encode()
+                    elif op == b'P':
+                        reply = recognizer.PartialResult().encode()
+                    elif op == b'F':
+                        reply = (await loop.run_in_executor(None, recognizer.FinalResult)).encode()
+                    elif op == b'X':
+                        recognizer.Reset()
+                        reply = b''
+                    else:
+                        raise ValueError(f"unknown op {op!r}")
+                    status = b'K'
+                except Exception as e:
+                    status, reply = b'E', str(e).encode()
+
+                writer.write(status + len(reply).to_bytes(4, 'big') + reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # Client went away
+        finally:
+            writer.close()
+
+def run_model_host(debug_mode):
+    """Load the model once and serve it to every local Chatty over a socket"""
+    config = load_config_file()
+    model_path = get_model_path(config)
+    path = get_model_host_socket(config)
+
+    # Errors go to stderr even without --debug; checked before the slow model load
+    if socket_in_use(path):
+        print(f"❌ Another model host is already listening on {path}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o755, exist_ok=True)
+    except OSError as e:
+        print(f"❌ Cannot create the socket directory: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    start_time = time.time()
+    try:
+        model = vosk.Model(model_path)
+    except Exception as e:
+        print(f"❌ Could not load the model from {model_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    host = ModelHost(model, debug_mode=debug_mode)
+    host.debug_print(f"✓ Model loaded from {model_path} ({time.time() - start_time:.2f}s)")
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, loop.stop)
+
+    if os.path.exists(path):
+        os.unlink(path)
+    try:
+        server = loop.run_until_complete(asyncio.start_unix_server(host.handle_client, path=path))
+    except OSError as e:
+        print(f"❌ Cannot listen on {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    # Every user on the machine may connect
+    os.chmod(path, 0o666)
+    host.debug_print(f"✓ Model host listening on {path}")
+
+    try:
+        loop.run_forever()
+    finally:
+        server.close()
+        os.unlink(path)
+        loop.close()
+
+# Model loaded once per batch transcription worker process
+_worker_model = None
+
+def init_transcribe_worker(model_path):
+    """Load the model once when a worker process starts"""
+    global _worker_model
+    vosk.SetLogLevel(-1)
+    _worker_model = vosk.Model(model_path)
+
+def transcribe_file(path, chunk_seconds=0.5):
+    """Stream a WAV or raw 16 kHz int16 file through a recognizer in chunks"""
+    start_time = time.perf_counter()
+    try:
+        if path.lower().endswith('.wav'):
+            audio_file = wave.open(path, 'rb')
+            if (audio_file.getnchannels() != 1 or audio_file.getsampwidth() != 2
+                    or audio_file.getcomptype() != 'NONE'):
+                audio_file.close()
+                raise ValueError("expected 16-bit mono PCM WAV")
+            sample_rate = audio_file.getframerate()
+            chunk_frames = int(sample_rate * chunk_seconds)
+            read_chunk = lambda: audio_file.readframes(chunk_frames)
+        else:
+            audio_file = open(path, 'rb')
+            sample_rate = 16000
+            chunk_bytes = int(sample_rate * chunk_seconds) * 2
+            read_chunk = lambda: audio_file.read(chunk_bytes)
+
+        with audio_file:
+            recognizer = vosk.KaldiRecognizer(_worker_model, sample_rate)
+            segments = []
+            audio_bytes = 0
+            while True:
+                chunk = read_chunk()
+                if not chunk:
+                    break
+                audio_bytes += len(chunk)
+                if recognizer.AcceptWaveform(chunk):
+                    segments.append(json.loads(recognizer.Result()).get("text", ""))
+            segments.append(json.loads(recognizer.FinalResult()).get("text", ""))
+
+        decode_seconds = time.perf_counter() - start_time
+        audio_seconds = audio_bytes / (2 * sample_rate)
+        return {
+            "file": path,
+            "text": " ".join(segment for segment in segments if segment),
+            "audio_s": round(audio_seconds, 3),
+            "decode_s": round(decode_seconds, 3),
+            "rtf": round(decode_seconds / audio_seconds, 3) if audio_seconds else None,
+        }
+    except Exception as e:
+        return {"file": path, "error": f"{type(e).__name__}: {e}"}
+
+def find_audio_files(paths):
+    """Expand directories into the WAV/raw files they contain"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in sorted(os.walk(path)):
+                files.extend(os.path.join(directory, name) for name in sorted(names)
+                             if name.lower().endswith(('.wav', '.raw', '.pcm')))
+        else:
+            files.append(path)
+    return files
+
+def run_transcribe(paths, model_path, jobs=None, output=None, chunk_seconds=0.5):
+    """Transcribe many files across worker processes, writing JSONL results"""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    files = find_audio_files(paths)
+    out = open(output, 'w') if output else sys.stdout
+    failures = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_transcribe_worker,
+                                 initargs=(model_path,)) as executor:
+            futures = [executor.submit(transcribe_file, path, chunk_seconds) for path in files]
+            # Results are written as soon as each file finishes
+            for future in as_completed(futures):
+                result = future.result()
+                failures += "error" in result
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if output:
+            out.close()
+
+    return failures
+
+def get_control_socket_path(config):
+    """Socket path from the config, defaulting to the user's runtime directory"""
+    if config.get("control_socket"):
+        return os.path.expanduser(config["control_socket"])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(runtime_dir, f"chatty-{os.getuid()}.sock")
+
+def socket_in_use(path):
+    """True if something is accepting connections on this Unix socket"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+            return True
+        except OSError:
+            return False
+
+def send_control_command(command, path):
+    """Send one command to a running Chatty and return its JSON reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall((command + "\n").encode())
+        reply = client.makefile('r').readline()
+    return json.loads(reply)
+
+def run_headless(debug_mode, profile_startup=False):
+    """Run capture and transcription without a window, controlled over the socket"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    app = Chatty(None, debug_mode=debug_mode, loop=loop, profile_startup=profile_startup)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, loop.stop)
+
+    loop.run_until_complete(app.start_control_server())
+    try:
+        loop.run_forever()
+    finally:
+        app.on_closing()
+        loop.close()
 
 def main():
     """Main function"""
@@ -659,8 +2417,84 @@ def main():
     parser = argparse.ArgumentParser(description='Chatty - Voice-to-Text application')
     parser.add_argument('--debug', action='store_true', 
                        help='Enable debug mode (shows console output)')
+    parser.add_argument('--headless', action='store_true',
+                       help='Run without a window, controlled through the control socket')
+    parser.add_argument('--model-host', action='store_true',
+                       help='Load the model once and serve it to other Chatty instances')
+    parser.add_argument('--profile-startup', action='store_true',
+                       help='Print how long each startup phase and import took')
+    parser.add_argument('--stats', nargs='?', const='', metavar='PATH',
+                       help='Print p50/p95 latency stats from the metrics file and exit')
+    subparsers = parser.add_subparsers(dest='subcommand')
+    ctl_parser = subparsers.add_parser('ctl', help='Send a command to a running Chatty')
+    ctl_parser.add_argument('command',
+                            choices=['start', 'stop', 'toggle', 'cancel', 'status', 'stats'])
+    history_parser = subparsers.add_parser('history', help='Search or re-paste past transcriptions')
+    history_parser.add_argument('query', nargs='*', help='Words to search for (default: latest)')
+    history_parser.add_argument('-n', '--limit', type=int, default=20, help='Entries to show')
+    history_parser.add_argument('--paste', type=int, metavar='ID',
+                                help='Copy this entry to the clipboard instead of listing')
+    history_parser.add_argument('--delay', type=float, metavar='SECONDS',
+                                help='With --paste, also paste it after this delay in the focused window')
+    transcribe_parser = subparsers.add_parser('transcribe', help='Transcribe audio files to JSONL')
+    transcribe_parser.add_argument('paths', nargs='+',
+                                   help='16-bit mono WAV or raw 16 kHz PCM files, or directories')
+    transcribe_parser.add_argument('-j', '--jobs', type=int, default=None,
+                                   help='Worker processes (default: one per CPU)')
+    transcribe_parser.add_argument('-o', '--output', help='Write JSONL here instead of stdout')
+    transcribe_parser.add_argument('--chunk-seconds', type=float, default=0.5,
+                                   help='Audio fed to the recognizer per call')
     args = parser.parse_args()
+
+    if args.subcommand == 'transcribe':
+        model_path = get_model_path(load_config_file())
+        failures = run_transcribe(args.paths, model_path, jobs=args.jobs, output=args.output,
+                                  chunk_seconds=args.chunk_seconds)
+        sys.exit(1 if failures else 0)
+
+    if args.stats is not None:
+        path = args.stats or load_config_file().get("metrics_file")
+        if not path:
+            print("❌ No metrics file: pass a path or set \"metrics_file\" in config.json",
+                  file=sys.stderr)
+            sys.exit(1)
+        try:
+            summary = load_metrics_summary(path)
+        except FileNotFoundError:
+            print(f"❌ No metrics recorded yet in {path}", file=sys.stderr)
+            sys.exit(1)
+        except OSError as e:
+            print(f"❌ Could not read metrics file: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(summary, indent=2))
+        sys.exit(0)
+
+    if args.subcommand == 'history':
+        ok = run_history(" ".join(args.query), limit=args.limit, paste_id=args.paste,
+                         paste_delay=args.delay)
+        sys.exit(0 if ok else 1)
+
+    if args.subcommand == 'ctl':
+        try:
+            reply = send_control_command(args.command, get_control_socket_path(load_config_file()))
+        except OSError as e:
+            print(f"❌ Could not reach Chatty: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(reply))
+        sys.exit(0 if reply.get("ok") else 1)
     
+    # The model host reports its own errors on stderr and prints nothing else without --debug
+    if args.model_host:
+        run_model_host(args.debug)
+        return
+
+    # Only one Chatty may own the microphone and hotkeys; a second window attaches to it
+    control_path = get_control_socket_path(load_config_file())
+    attach = socket_in_use(control_path)
+    if attach and args.headless:
+        print(f"❌ Chatty is already running on {control_path}", file=sys.stderr)
+        sys.exit(1)
+
     # Hide console window on Windows unless debug mode is enabled
     if not args.debug and sys.platform == "win32":
         import ctypes
@@ -669,13 +2503,26 @@ def main():
     # Suppress print output unless in debug mode
     if not args.debug:
         # Redirect stdout and stderr to devnull
-        import os
         devnull = open(os.devnull, 'w')
         sys.stdout = devnull
         sys.stderr = devnull
+
+    if args.headless:
+        run_headless(args.debug, args.profile_startup)
+        return
     
+    start = time.perf_counter()
     root = tk.Tk()
-    app = Chatty(root, debug_mode=args.debug)
+    record_startup("create window", start)
+    if attach:
+        # A headless Chatty already captures and decodes; the window only shows its state
+        app = ChattyClient(root, control_path, debug_mode=args.debug)
+    else:
+        app = Chatty(root, debug_mode=args.debug, profile_startup=args.profile_startup)
+
+        # The window can expose the same control socket as headless mode
+        if app.config["control_server"]:
+            threading.Thread(target=app.run_control_loop, daemon=True).start()
 
     # Handle window closing
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
@@ -686,4 +2533,4 @@ def main():
         app.on_closing()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -7,23 +7,20 @@ echo "🎙️ Starting Chatty..."
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 cd "$SCRIPT_DIR"
 
-# Activate virtual environment
-source chatty/bin/activate
-
-# Check if model exists
-if [ ! -d "vosk_model/vosk-model-small-en-us-0.15" ]; then
-    echo "❌ Vosk model not found!"
+# Check if the virtual environment exists; the model is checked by Chatty itself,
+# since "model_path" or "use_model_host" may point elsewhere
+if [ ! -x "chatty/bin/python3" ]; then
+    echo "❌ Python environment not found!"
     echo "💡 Run ./install.sh first"
     exit 1
 fi
 
-# Disable system beep
-xset -b 2>/dev/null || true
+# Disable system beep without waiting for the X server
+(xset -b 2>/dev/null || true) &
 
-# Run Chatty with debug flag if provided
+# Run Chatty, passing through flags such as --debug or --headless
 if [ "$1" = "--debug" ]; then
     echo "🔧 Running in debug mode..."
-    python3 src/chatty.py --debug
-else
-    python3 src/chatty.py
-fi
\ No newline at end of file
+fi
+# Use the venv's interpreter directly instead of activating the venv
+exec chatty/bin/python3 src/chatty.py "$@"
\ No newline at end of file